@@ -2,18 +2,28 @@
 """
 Apply Documentation Tags
 
-Reads tagging_plan.json and automatically applies @doc tags to code files.
+Reads tagging_plan.json (or tagging_plan.jsonl, whichever was written last)
+and automatically applies @doc tags to code files. A jsonl plan is applied
+one file's entries at a time as it is read. --plan applies another plan
+instead, e.g. one owner's shard from docs/dev/tagging_plan_owners/.
 
 SAFETY FEATURES:
 - Dry run mode by default
 - Creates backups before modification
 - Validates line numbers before insertion
-- Batch processing with rollback on error
+- Each file is loaded once, gets all of its tags in memory and is written once
+- Journaled, atomic batches: every modified file is first staged under
+  .tag-backups/.journal/, and only once the whole batch is staged are the
+  files swapped in with os.replace. A run interrupted before that point
+  leaves the sources untouched and is rolled back on the next run; one
+  interrupted while swapping is rolled forward. No file is ever left
+  half-written.
 
 Usage:
   python3 scripts/apply_tags.py --dry-run   # Preview changes (default)
   python3 scripts/apply_tags.py --apply     # Apply changes
   python3 scripts/apply_tags.py --rollback  # Restore backups
+  python3 scripts/apply_tags.py --apply --plan docs/dev/tagging_plan_owners/<owner>.json
 """
 
 import os
@@ -21,36 +31,214 @@ import re
 import sys
 import json
 import shutil
+import hashlib
+import argparse
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from audit_scanners import INDEXED_SUFFIXES
+from fingerprints import sha256_file
+from tagging_store import PLAN_BASE, RecordReader, find_file, output_path
+from ts_symbol_index import Symbol, SymbolIndex
+
+# Journal and staged files, inside the backup directory but not backups
+JOURNAL_DIR = ".journal"
+
+def fsync_write(file_path: str, data: str):
+    """Write a file and flush it to disk"""
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+def copy_atomic(src: str, dst: str):
+    """Copy src over dst through a temp file and os.replace (dst is never partial)"""
+    tmp_path = f"{dst}.tag-tmp"
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+class TagJournal:
+    """
+    Append-only journal of one apply batch (.tag-backups/.journal/journal.jsonl):
+
+      {"op": "begin"}                                  batch started
+      {"op": "stage", "file", "staged", "before", "after", "tags"}
+                                                       new content staged
+      {"op": "staged"}                                 every file staged
+      {"op": "committed"}                              every file replaced
+
+    Source files are only replaced after "staged" is on disk, so recovery
+    rolls a batch forward when that record exists and back (discarding the
+    staged copies) when it does not. A file is staged at most once per batch. The journal and staged copies are
+    removed once a batch is committed or rolled back.
+    """
+
+    def __init__(self, backup_dir: str):
+        self.dir = os.path.join(backup_dir, JOURNAL_DIR)
+        self.path = os.path.join(self.dir, "journal.jsonl")
+        self.staged_dir = os.path.join(self.dir, "staged")
+        self.entries: List[Dict] = []
+
+    def pending(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _append(self, record: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read(self) -> List[Dict]:
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break  # Torn final record from the interrupted write
+        return records
+
+    def begin(self):
+        os.makedirs(self.dir, exist_ok=True)
+        self._append({"op": "begin"})
+
+    def stage(self, file_path: str, content: str, tags: int):
+        """Write a file's new content next to the journal; the source is not touched yet"""
+        if any(entry["file"] == file_path for entry in self.entries):
+            raise ValueError(f"{file_path} is already staged in this batch")
+
+        staged_path = os.path.join(self.staged_dir, file_path)
+        fsync_write(staged_path, content)
+        shutil.copymode(file_path, staged_path)
+
+        entry = {
+            "op": "stage",
+            "file": file_path,
+            "staged": staged_path,
+            "before": sha256_file(file_path),
+            "after": hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            "tags": tags,
+        }
+        self._append(entry)
+        self.entries.append(entry)
+
+    def commit(self) -> List[Dict]:
+        """Mark the batch staged, then swap every staged file in; returns the entries replaced"""
+        self._append({"op": "staged"})
+        replaced = self._roll_forward(self.entries)
+        self._finish("committed")
+        return replaced
+
+    def rollback(self):
+        """Discard the staged files (the sources were never touched)"""
+        self._finish("rolled_back")
+
+    def _roll_forward(self, entries: List[Dict]) -> List[Dict]:
+        replaced = []
+        for entry in entries:
+            current = sha256_file(entry["file"])
+            if not os.path.exists(entry["staged"]):
+                if current == entry["after"]:
+                    replaced.append(entry)  # Replaced before the interruption
+                else:
+                    print(f"   ❌ {entry['file']}: staged copy missing - not replaced")
+                continue
+            if current != entry["before"]:
+                print(f"   ❌ {entry['file']} changed since it was staged - not replacing it")
+                continue
+            os.replace(entry["staged"], entry["file"])
+            replaced.append(entry)
+        return replaced
+
+    def _finish(self, outcome: str):
+        self._append({"op": outcome})
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.entries = []
+
+    def recover(self) -> Optional[str]:
+        """Finish a batch left by an interrupted run: "rolled_forward", "rolled_back" or None"""
+        if not self.pending():
+            return None
+
+        records = self._read()
+        ops = {record["op"] for record in records}
+
+        if ops & {"committed", "rolled_back"}:
+            # Finished; only the cleanup was interrupted
+            shutil.rmtree(self.dir, ignore_errors=True)
+            return None
+
+        if "staged" in ops:
+            stages = [record for record in records if record["op"] == "stage"]
+            replaced = self._roll_forward(stages)
+            self._finish("committed")
+            print(f"   🔁 Rolled an interrupted batch forward ({len(replaced)} of {len(stages)} files replaced)")
+            return "rolled_forward"
+
+        self._finish("rolled_back")
+        print("   ↩️  Rolled an interrupted batch back (no source file had been modified)")
+        return "rolled_back"
 
 class TagApplicator:
     """Applies documentation tags to code files"""
 
-    def __init__(self, dry_run: bool = True):
+    def __init__(self, dry_run: bool = True, plan_file: Optional[str] = None):
         self.dry_run = dry_run
+        # None = the plan generate_tagging_plan.py wrote last
+        self.plan_file = plan_file
         self.plan: Dict = {}
+        self.reader: Optional[RecordReader] = None
         self.applied_count = 0
         self.failed_count = 0
+        # Some staged files could not be replaced when the batch was committed
+        self.commit_failed = False
         self.backup_dir = ".tag-backups"
+        self.journal = TagJournal(self.backup_dir)
+        self.index: Optional[SymbolIndex] = None
 
     def load_plan(self) -> bool:
-        """Load tagging plan"""
-        plan_file = "docs/dev/tagging_plan.json"
+        """Open the tagging plan (entries are read as they are applied)"""
+        plan_file = self.plan_file or find_file(PLAN_BASE)
 
-        if not os.path.exists(plan_file):
-            print(f"❌ Plan not found: {plan_file}")
+        if plan_file is None or not os.path.exists(plan_file):
+            print(f"❌ Plan not found: {plan_file or output_path(PLAN_BASE, 'json')}")
             print("   Run: python3 scripts/generate_tagging_plan.py")
             return False
 
         try:
-            with open(plan_file, 'r', encoding='utf-8') as f:
-                self.plan = json.load(f)
+            self.reader = RecordReader(plan_file)
+            self.plan = self.reader.header
             return True
         except Exception as e:
             print(f"❌ Error loading plan: {e}")
             return False
 
+    def ready_items_by_file(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Ready plan entries per file, each file once (a jsonl plan is already
+        grouped by file; one that is not is rejected rather than applied in
+        several passes over the same file)
+        """
+        if self.reader.streaming:
+            seen = set()
+            for file_path, entries in self.reader.items_by_file():
+                if file_path in seen:
+                    raise ValueError(f"{self.reader.path} is not grouped by file: "
+                                     f"{file_path} appears more than once")
+                seen.add(file_path)
+                entries = [i for i in entries if i["status"] == "ready"]
+                if entries:
+                    yield file_path, entries
+            return
+
+        by_file: Dict[str, List[Dict]] = {}
+        for item in self.reader.items():
+            if item["status"] == "ready":
+                by_file.setdefault(item["file"], []).append(item)
+
+        yield from sorted(by_file.items())
+
     def create_backup(self, file_path: str) -> bool:
         """Create backup of file before modification"""
         try:
@@ -64,8 +252,8 @@ class TagApplicator:
             # Create parent directories
             os.makedirs(os.path.dirname(backup_path), exist_ok=True)
 
-            # Copy file
-            shutil.copy2(file_path, backup_path)
+            # Copy file (a torn backup must never be restored)
+            copy_atomic(file_path, backup_path)
 
             return True
 
@@ -73,83 +261,127 @@ class TagApplicator:
             print(f"❌ Failed to backup {file_path}: {e}")
             return False
 
-    def validate_insertion_point(self, file_path: str, line_number: int, search_pattern: str) -> bool:
-        """Validate that insertion point is still correct"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Check if line number is valid
-            if line_number < 1 or line_number > len(lines):
-                print(f"   ⚠️  Invalid line number: {line_number} (file has {len(lines)} lines)")
-                return False
+    def load_file(self, file_path: str) -> Tuple[List[str], Optional[List[Symbol]]]:
+        """A file's lines and, for TypeScript files, its indexed symbols"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
 
-            # Check if search pattern still matches
-            target_line = lines[line_number - 1]
+        symbols = None
+        if file_path.endswith(INDEXED_SUFFIXES):
+            symbols = self.index.file(file_path).symbols
 
-            # Extract search pattern from item name
-            # (This is a simplified check - could be more robust)
-            if "export" not in target_line:
-                print(f"   ⚠️  Line {line_number} doesn't contain expected export")
-                return False
+        return lines, symbols
 
-            return True
+    def validate_insertion_point(self, lines: List[str], symbols: Optional[List[Symbol]],
+                                 line_number: int, item_name: str) -> bool:
+        """Validate that insertion point is still correct in the file as loaded"""
+        if symbols is not None:
+            return self.validate_symbol(symbols, line_number, item_name)
 
-        except Exception as e:
-            print(f"   ❌ Validation error: {e}")
+        # Check if line number is valid
+        if line_number < 1 or line_number > len(lines):
+            print(f"   ⚠️  Invalid line number: {line_number} (file has {len(lines)} lines)")
             return False
 
-    def apply_tag(self, plan_item: Dict) -> bool:
-        """Apply a single tag to a file"""
-        if plan_item["status"] != "ready":
-            return False
+        # Check if search pattern still matches
+        target_line = lines[line_number - 1]
 
-        file_path = plan_item["file"]
-        line_number = plan_item["insert_before_line"]
-        tag_content = plan_item["tag_content"]
-        item_name = plan_item["item"]["name"]
+        # Extract search pattern from item name
+        # (This is a simplified check - could be more robust)
+        if "export" not in target_line:
+            print(f"   ⚠️  Line {line_number} doesn't contain expected export")
+            return False
 
-        print(f"   📝 {file_path}:{line_number} - {item_name}")
+        return True
 
-        # Dry run - just show what would be done
-        if self.dry_run:
-            print(f"      [DRY RUN] Would insert tag before line {line_number}")
-            return True
+    def validate_symbol(self, symbols: List[Symbol], line_number: int, item_name: str) -> bool:
+        """Check the symbol index still has the item declared at line_number, without a @doc block"""
+        symbol = next((s for s in symbols if s.name == item_name and s.line == line_number), None)
 
-        # Validate insertion point
-        if not self.validate_insertion_point(file_path, line_number, item_name):
-            print(f"      ❌ Validation failed - skipping")
+        if symbol is None:
+            print(f"   ⚠️  Line {line_number} doesn't declare expected {item_name}")
             return False
 
-        # Create backup
-        if not self.create_backup(file_path):
-            print(f"      ❌ Backup failed - skipping")
+        if symbol.has_doc:
+            print(f"   ⚠️  {item_name} already has a @doc block (@doc:{symbol.doc_tag})")
             return False
 
+        return True
+
+    def insert_tags(self, lines: List[str], plan_items: List[Dict]) -> List[str]:
+        """
+        The file's lines with every item's tag inserted, in one pass from the
+        bottom up: plan line numbers all refer to the file as loaded, so no
+        insert shifts the ones still to come.
+        """
+        by_index: Dict[int, List[str]] = {}
+        for plan_item in plan_items:
+            by_index.setdefault(plan_item["insert_before_line"] - 1, []).append(plan_item["tag_content"])
+
+        output: List[str] = []
+        for index in range(len(lines) - 1, -1, -1):
+            output.append(lines[index])
+
+            # Add tag lines, indented like the declaration (router procedures are nested)
+            indent = re.match(r'[ \t]*', lines[index]).group()
+            for tag_content in reversed(by_index.get(index, ())):
+                output.extend(indent + line + "\n" for line in reversed(tag_content.split("\n")))
+
+        output.reverse()
+        return output
+
+    def apply_file(self, file_path: str, plan_items: List[Dict]) -> int:
+        """
+        Apply all of a file's tags: load it once, validate every insertion
+        point, insert them all in memory and write the file once. Returns the
+        number of tags applied.
+        """
+        if self.dry_run:
+            for plan_item in plan_items:
+                line_number = plan_item["insert_before_line"]
+                print(f"   📝 {file_path}:{line_number} - {plan_item['item']['name']}")
+                print(f"      [DRY RUN] Would insert tag before line {line_number}")
+            return len(plan_items)
+
         try:
-            # Read file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            lines, symbols = self.load_file(file_path)
+        except Exception as e:
+            print(f"   ❌ Validation error: {e}")
+            return 0
 
-            # Insert tag before target line
-            insert_index = line_number - 1
+        valid: List[Dict] = []
+        for plan_item in plan_items:
+            line_number = plan_item["insert_before_line"]
+            item_name = plan_item["item"]["name"]
+            print(f"   📝 {file_path}:{line_number} - {item_name}")
 
-            # Add tag lines
-            tag_lines = [line + "\n" for line in tag_content.split("\n")]
+            # Validate insertion point
+            if not self.validate_insertion_point(lines, symbols, line_number, item_name):
+                print(f"      ❌ Validation failed - skipping")
+                continue
 
-            # Insert
-            lines = lines[:insert_index] + tag_lines + lines[insert_index:]
+            valid.append(plan_item)
 
-            # Write back
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
+        if not valid:
+            return 0
 
-            print(f"      ✅ Tag applied")
-            return True
+        # Create backup
+        if not self.create_backup(file_path):
+            print(f"   ❌ Backup failed - skipping {file_path}")
+            return 0
+
+        try:
+            lines = self.insert_tags(lines, valid)
+
+            # Stage the new content once; the batch commit replaces the file
+            self.journal.stage(file_path, "".join(lines), len(valid))
 
         except Exception as e:
-            print(f"      ❌ Failed to apply tag: {e}")
-            return False
+            print(f"   ❌ Failed to apply tags: {e}")
+            return 0
+
+        print(f"   ✅ {len(valid)} tags staged")
+        return len(valid)
 
     def apply_all(self):
         """Apply all tags from plan"""
@@ -163,35 +395,49 @@ class TagApplicator:
             print("🚨 DRY RUN MODE - No files will be modified")
             print()
 
-        items = [i for i in self.plan.get("items", []) if i["status"] == "ready"]
-
-        if not items:
-            print("⚠️  No items ready to tag")
-            return
-
-        print(f"📦 Processing {len(items)} items...")
+        if "ready" in self.plan:
+            print(f"📦 Processing {self.plan['ready']} items...")
+        else:
+            print("📦 Processing items as the plan is read...")
         print()
 
-        # Group by file
-        by_file: Dict[str, List[Dict]] = {}
-        for item in items:
-            file_path = item["file"]
-            if file_path not in by_file:
-                by_file[file_path] = []
-            by_file[file_path].append(item)
-
-        # Process each file
-        for file_path, file_items in sorted(by_file.items()):
-            print(f"📄 {file_path} ({len(file_items)} tags)")
+        processed = 0
 
-            for item in file_items:
-                success = self.apply_tag(item)
+        if not self.dry_run:
+            self.journal.begin()
 
-                if success:
-                    self.applied_count += 1
-                else:
-                    self.failed_count += 1
+        try:
+            # Process each file
+            for file_path, file_items in self.ready_items_by_file():
+                processed += len(file_items)
+                print(f"📄 {file_path} ({len(file_items)} tags)")
+
+                applied = self.apply_file(file_path, file_items)
+                self.applied_count += applied
+                self.failed_count += len(file_items) - applied
+
+                print()
+        except BaseException:
+            if not self.dry_run:
+                self.journal.rollback()
+                print("↩️  Batch rolled back - no files were modified")
+            raise
+
+        if not processed:
+            print("⚠️  No items ready to tag")
 
+        if not self.dry_run:
+            staged = self.journal.entries
+            replaced = self.journal.commit()
+            print(f"💾 Committed {len(replaced)} of {len(staged)} staged files")
+
+            # Tags of files that were staged but not replaced never landed
+            lost = sum(entry["tags"] for entry in staged if entry not in replaced)
+            if lost:
+                self.applied_count -= lost
+                self.failed_count += lost
+                self.commit_failed = True
+                print(f"❌ {len(staged) - len(replaced)} staged files were not replaced ({lost} tags)")
             print()
 
     def print_summary(self):
@@ -208,10 +454,13 @@ class TagApplicator:
         if self.dry_run:
             print("💡 This was a dry run. No files were modified.")
             print("   Run with --apply to apply changes.")
+        elif self.commit_failed:
+            print("❌ Some staged files were not replaced; their tags were not applied")
         else:
             print(f"✅ Tags applied successfully!")
             print()
             print("📦 Backups saved to: .tag-backups/")
+            print("   An interrupted run is rolled forward or back by the next run")
             print()
             print("🔧 Next steps:")
             print("   1. Review applied tags")
@@ -236,9 +485,11 @@ class TagApplicator:
             print("❌ No backups found")
             return
 
-        # Find all backup files
+        # Find all backup files (the journal is not a backup)
         backup_files = []
         for root, dirs, files in os.walk(self.backup_dir):
+            if root == self.backup_dir and JOURNAL_DIR in dirs:
+                dirs.remove(JOURNAL_DIR)
             for file in files:
                 backup_path = os.path.join(root, file)
                 rel_path = os.path.relpath(backup_path, self.backup_dir)
@@ -260,7 +511,7 @@ class TagApplicator:
         for backup_path, rel_path in backup_files:
             try:
                 # Restore file
-                shutil.copy2(backup_path, rel_path)
+                copy_atomic(backup_path, rel_path)
                 print(f"   ✅ Restored: {rel_path}")
                 restored += 1
 
@@ -288,6 +539,14 @@ class TagApplicator:
         print("🏷️  Documentation Tag Applicator")
         print("=" * 60)
 
+        # Finish a batch an interrupted run left behind
+        if self.journal.pending():
+            if mode == "dry-run":
+                print("⚠️  An interrupted batch is pending; it will be recovered on the next --apply")
+            else:
+                self.journal.recover()
+            print()
+
         if mode == "rollback":
             self.rollback()
             return 0
@@ -296,41 +555,61 @@ class TagApplicator:
         if not self.load_plan():
             return 1
 
-        print(f"✅ Loaded plan: {self.plan['total_items']} items")
-        print(f"   Ready to tag: {self.plan['ready']}")
+        print(f"✅ Loaded plan: {self.reader.path}")
+        if self.plan.get("owner"):
+            print(f"   Owner shard: {self.plan['owner']}")
+        if "total_items" in self.plan:
+            print(f"   {self.plan['total_items']} items, ready to tag: {self.plan['ready']}")
         print()
 
         # Apply tags
-        self.apply_all()
+        self.index = SymbolIndex()
+        try:
+            self.apply_all()
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        finally:
+            self.index.close()
+            self.reader.close()
 
         # Print summary
         self.print_summary()
 
-        return 0
-
-def main():
-    # Parse arguments
-    mode = "dry-run"  # Default
-
-    if len(sys.argv) > 1:
-        arg = sys.argv[1]
-        if arg == "--apply":
-            mode = "apply"
-        elif arg == "--rollback":
-            mode = "rollback"
-        elif arg == "--dry-run":
-            mode = "dry-run"
-        else:
-            print(f"❌ Unknown argument: {arg}")
-            print()
-            print("Usage:")
-            print("  python3 scripts/apply_tags.py --dry-run   # Preview changes (default)")
-            print("  python3 scripts/apply_tags.py --apply     # Apply changes")
-            print("  python3 scripts/apply_tags.py --rollback  # Restore backups")
-            return 1
-
-    applicator = TagApplicator(dry_run=(mode != "apply"))
-    return applicator.run(mode)
+        return 1 if self.commit_failed else 0
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply the @doc tags of a tagging plan (dry run by default)"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--dry-run",
+        dest="mode", action="store_const", const="dry-run",
+        help="preview changes (default)"
+    )
+    mode.add_argument(
+        "--apply",
+        dest="mode", action="store_const", const="apply",
+        help="apply changes"
+    )
+    mode.add_argument(
+        "--rollback",
+        dest="mode", action="store_const", const="rollback",
+        help="restore backups"
+    )
+    parser.add_argument(
+        "--plan",
+        metavar="PATH",
+        help="plan to apply, e.g. an owner shard (default: docs/dev/tagging_plan.json or .jsonl)"
+    )
+    parser.set_defaults(mode="dry-run")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    applicator = TagApplicator(dry_run=(args.mode != "apply"), plan_file=args.plan)
+    return applicator.run(args.mode)
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Taggable Items Audit Scanners
+
+Scanner plugins for audit_taggable_items.py. Each plugin declares the files
+it cares about as gitignore-style globs relative to the repo root ("!" to
+exclude) and turns them into audit items in scan().
+
+Plugins never open files themselves. They get a ScanContext with:
+- symbols(): exported declarations and router procedures from the
+  TypeScript symbol index (ts_symbol_index.py), refreshed once per file
+- env_refs(): process.env reads recorded by the same index pass (a plugin
+  can declare an index_marker so files that cannot contain what it reads
+  are not tokenized for it)
+- content(): decoded file text from the shared SourceCache, so each file is
+  read at most once per audit however many plugins want it
+- existing_tags: every @doc tag found in the sources
+- findings: report data that is not a taggable item (e.g. env var usage)
+
+To add an item kind, subclass ScannerPlugin and decorate it with
+@register_scanner. Plugins run in registration order, which is also the
+order their items are merged in.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+import pathspec
+
+from ts_lexer import decode_source
+from ts_symbol_index import ITEM_SYMBOLS, IndexedFile, Symbol
+
+ROUTERS_DIR = Path("app/server/routers")
+COMPONENTS_DIR = Path("components")
+SCHEMA_FILE = Path("lib/db/schema.ts")
+ENV_EXAMPLE = Path(".env.example")
+
+# Directories whose process.env reads are checked against .env.example, with
+# the repo-root TS files (next.config.ts, middleware.ts, instrumentation.ts,
+# sentry.*.config.ts, ...)
+ENV_SOURCE_DIRS = ["app", "components", "lib", "server"]
+
+# Set by Node/Next.js or the CI platform, never declared in .env.example
+RUNTIME_ENV_VARS = {"NODE_ENV", "NEXT_RUNTIME", "NEXT_PHASE", "CI", "VERCEL", "VERCEL_ENV", "VERCEL_URL"}
+
+# Read by a dependency rather than by our code (better-auth reads its secret itself)
+DEPENDENCY_ENV_VARS = {"BETTER_AUTH_SECRET"}
+
+# Suffixes the symbol index understands
+INDEXED_SUFFIXES = (".ts", ".tsx")
+
+class SourceCache:
+    """Raw bytes of every file read during one audit, shared between the source pass and plugins"""
+
+    def __init__(self):
+        self._data: Dict[Path, bytes] = {}
+        self._lock = threading.Lock()
+
+    def put(self, file_path: Path, data: bytes):
+        with self._lock:
+            self._data[file_path] = data
+
+    def read(self, file_path: Path) -> bytes:
+        """File bytes, reading the file only if nothing has yet"""
+        with self._lock:
+            data = self._data.get(file_path)
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            self.put(file_path, data)
+        return data
+
+    def text(self, file_path: Path) -> str:
+        """Decoded content with newlines normalised as open() in text mode would"""
+        return decode_source(self.read(file_path))
+
+class ScanContext:
+    """What one plugin sees during a scan"""
+
+    def __init__(
+        self,
+        files: List[Path],
+        indexed: Dict[Path, IndexedFile],
+        sources: SourceCache,
+        existing_tags: Set[str],
+    ):
+        self.files = files
+        self.existing_tags = existing_tags
+        self._indexed = indexed
+        self._sources = sources
+        # Matches seen by the plugin; content-only plugins count their own
+        self.match_count = 0
+        # Report section for non-item results, keyed by the plugin
+        self.findings: Dict = {}
+
+    def symbols(self, where: Callable[[Symbol], bool]) -> Iterator[Tuple[Path, Symbol]]:
+        """(file, symbol) for the plugin's files, in walk and file order"""
+        for file_path in self.files:
+            indexed = self._indexed.get(file_path)
+            for symbol in indexed.symbols if indexed else ():
+                if where(symbol):
+                    self.match_count += 1
+                    yield file_path, symbol
+
+    def env_refs(self) -> Iterator[Tuple[Path, str, int]]:
+        """(file, variable, line) of every process.env read in the plugin's files"""
+        for file_path in self.files:
+            indexed = self._indexed.get(file_path)
+            for name, line in indexed.env_refs if indexed else ():
+                yield file_path, name, line
+
+    def content(self, file_path: Path) -> str:
+        return self._sources.text(file_path)
+
+class ScannerPlugin:
+    """Base class for item scanners"""
+
+    # Report/timing key and progress banner
+    name = ""
+    banner = ""
+    # Gitignore-style globs relative to the repo root
+    globs: List[str] = []
+    # Whether the plugin reads symbols()/env_refs() (its TypeScript files are
+    # indexed) or only content()
+    uses_symbols = True
+    # Bytes a file must contain for the plugin to find anything in its index
+    # entry; files without them are not indexed for the plugin (None: always)
+    index_marker: Optional[bytes] = None
+
+    def __init__(self):
+        self.spec = pathspec.GitIgnoreSpec.from_lines(self.globs)
+
+    def wants(self, file_path: Path) -> bool:
+        return self.spec.match_file(str(file_path))
+
+    def indexes(self, file_path: Path) -> bool:
+        """Whether a wanted file needs to be in the symbol index"""
+        return self.uses_symbols and file_path.suffix in INDEXED_SUFFIXES
+
+    def scan(self, ctx: ScanContext, log: List[str]) -> List[Dict]:
+        raise NotImplementedError
+
+SCANNER_REGISTRY: List[Type[ScannerPlugin]] = []
+
+def register_scanner(cls: Type[ScannerPlugin]) -> Type[ScannerPlugin]:
+    SCANNER_REGISTRY.append(cls)
+    return cls
+
+def create_scanners() -> List[ScannerPlugin]:
+    """One instance of every registered plugin, in registration order"""
+    return [cls() for cls in SCANNER_REGISTRY]
+
+@register_scanner
+class TrpcProcedureScanner(ScannerPlugin):
+    """tRPC procedures: router({ key: xProcedure... }) entries and exported x.query/mutation"""
+
+    name = "trpc_procedures"
+    banner = "📡 Scanning tRPC routers..."
+    globs = [f"/{ROUTERS_DIR}/*.ts"]
+
+    def scan(self, ctx: ScanContext, log: List[str]) -> List[Dict]:
+        items: List[Dict] = []
+
+        if not ROUTERS_DIR.exists():
+            log.append("   ⚠️  Routers directory not found")
+            return items
+
+        for router_file, symbol in ctx.symbols(ITEM_SYMBOLS["trpc_procedure"]):
+            router_name = router_file.stem
+            procedure_name = symbol.name
+
+            # Check if already tagged
+            tag_target = f"api/{router_name}#{procedure_name}"
+
+            if tag_target in ctx.existing_tags:
+                continue  # Already tagged
+
+            items.append({
+                "type": "trpc_procedure",
+                "category": "api",
+                "file": str(router_file),
+                "name": procedure_name,
+                "router": router_name,
+                "suggested_tag": tag_target,
+                "priority": "high"
+            })
+
+        log.append(f"   Found {len(items)} untagged procedures")
+        return items
+
+@register_scanner
+class DatabaseTableScanner(ScannerPlugin):
+    """Drizzle table definitions (export const x = pgTable(...))"""
+
+    name = "database_tables"
+    banner = "🗄️  Scanning database schema..."
+    globs = [f"/{SCHEMA_FILE}"]
+
+    def scan(self, ctx: ScanContext, log: List[str]) -> List[Dict]:
+        items: List[Dict] = []
+
+        if not SCHEMA_FILE.exists():
+            log.append("   ⚠️  Schema file not found")
+            return items
+
+        for schema_file, symbol in ctx.symbols(ITEM_SYMBOLS["database_table"]):
+            table_name = symbol.name
+
+            # Check if already tagged
+            tag_target = f"db/schema#{table_name}"
+
+            if tag_target in ctx.existing_tags:
+                continue
+
+            items.append({
+                "type": "database_table",
+                "category": "db",
+                "file": str(schema_file),
+                "name": table_name,
+                "suggested_tag": tag_target,
+                "priority": "medium"
+            })
+
+        log.append(f"   Found {len(items)} untagged tables")
+        return items
+
+@register_scanner
+class ReactComponentScanner(ScannerPlugin):
+    """Exported React components outside components/ui"""
+
+    name = "components"
+    banner = "🧩 Scanning components..."
+    # Skip ui components (already documented); node_modules is pruned by the walk
+    globs = [f"/{COMPONENTS_DIR}/**/*.tsx", f"!/{COMPONENTS_DIR}/ui/**"]
+
+    def scan(self, ctx: ScanContext, log: List[str]) -> List[Dict]:
+        items: List[Dict] = []
+
+        if not COMPONENTS_DIR.exists():
+            log.append("   ⚠️  Components directory not found")
+            return items
+
+        for component_file, symbol in ctx.symbols(ITEM_SYMBOLS["react_component"]):
+            component_name = symbol.name
+
+            # Only tag if it's a React component (starts with uppercase)
+            if not component_name[0].isupper():
+                continue
+
+            # Determine category
+            if "components/ui" in str(component_file):
+                category = "components/ui"
+            else:
+                category = "components/custom"
+
+            # Check if already tagged
+            tag_target = f"{category}#{component_name}"
+
+            if tag_target in ctx.existing_tags:
+                continue
+
+            # Only tag reusable components (not page-specific ones)
+            # Skip if file has "page" in name
+            if "page" in component_file.stem.lower():
+                continue
+
+            items.append({
+                "type": "react_component",
+                "category": category,
+                "file": str(component_file),
+                "name": component_name,
+                "suggested_tag": tag_target,
+                "priority": "low"
+            })
+
+        log.append(f"   Found {len(items)} untagged components")
+        return items
+
+@register_scanner
+class EnvVarScanner(ScannerPlugin):
+    """
+    Variables declared in .env.example, cross-checked against the process.env
+    reads in the sources: reads of undeclared variables and declared variables
+    nothing reads are reported as findings.
+    """
+
+    name = "env_vars"
+    banner = "🔧 Scanning environment variables..."
+    globs = [f"/{ENV_EXAMPLE}"] + [f"/*{ext}" for ext in INDEXED_SUFFIXES] + [
+        f"/{d}/**/*{ext}" for d in ENV_SOURCE_DIRS for ext in INDEXED_SUFFIXES
+    ]
+    # Only env_refs() are read: files that never mention process have none
+    index_marker = b"process"
+
+    def scan(self, ctx: ScanContext, log: List[str]) -> List[Dict]:
+        items: List[Dict] = []
+
+        if ENV_EXAMPLE not in ctx.files:
+            log.append("   ⚠️  .env.example not found")
+            return items
+
+        try:
+            lines = ctx.content(ENV_EXAMPLE).split("\n")
+        except Exception as e:
+            log.append(f"   ⚠️  Error reading .env.example: {e}")
+            return items
+
+        declared: Dict[str, int] = {}
+
+        for line_number, line in enumerate(lines, 1):
+            # Skip comments and empty lines
+            if line.strip().startswith("#") or not line.strip():
+                continue
+
+            # Parse VAR_NAME=value
+            match = re.match(r'([A-Z_][A-Z0-9_]*)=', line)
+            if not match:
+                continue
+
+            ctx.match_count += 1
+            var_name = match.group(1)
+            declared.setdefault(var_name, line_number)
+            category = env_category(var_name)
+
+            # Check if already tagged
+            tag_target = f"{category}#{var_name}"
+
+            if tag_target in ctx.existing_tags:
+                continue
+
+            items.append({
+                "type": "environment_variable",
+                "category": category,
+                "file": str(ENV_EXAMPLE),
+                "name": var_name,
+                "suggested_tag": tag_target,
+                "priority": "medium"
+            })
+
+        log.append(f"   Found {len(items)} untagged environment variables")
+
+        references: Dict[str, List[Dict]] = {}
+        for file_path, var_name, line in ctx.env_refs():
+            references.setdefault(var_name, []).append({"file": str(file_path), "line": line})
+
+        undocumented = [
+            {"name": var_name, "category": env_category(var_name), "references": refs}
+            for var_name, refs in sorted(references.items())
+            if var_name not in declared and var_name not in RUNTIME_ENV_VARS
+        ]
+        unused = [
+            {"name": var_name, "category": env_category(var_name), "line": line}
+            for var_name, line in sorted(declared.items())
+            if var_name not in references and var_name not in DEPENDENCY_ENV_VARS
+        ]
+
+        ctx.findings = {
+            "referenced": len(references),
+            "undocumented": undocumented,
+            "unused": unused,
+        }
+
+        log.append(f"   {len(references)} variables read in code: "
+                   f"{len(undocumented)} missing from .env.example, {len(unused)} declared but unused")
+        return items
+
+def env_category(var_name: str) -> str:
+    """Tag category for an environment variable"""
+    if "DATABASE" in var_name or "DB_" in var_name:
+        return "env/database"
+    elif "AUTH" in var_name:
+        return "env/auth"
+    elif "S3_" in var_name or "STORAGE" in var_name:
+        return "env/storage"
+    elif "SENTRY" in var_name:
+        return "env/sentry"
+    else:
+        return "env/general"
@@ -5,265 +5,368 @@ Taggable Items Audit
 Scans the codebase for items that should have @doc tags but currently don't.
 Generates an inventory report with recommendations for tagging.
 
-Usage: python3 scripts/audit_taggable_items.py
-Output: docs/dev/taggable_items_report.json
+Usage: python3 scripts/audit_taggable_items.py [--jobs N] [--no-cache] [--format json|jsonl]
+Output: docs/dev/taggable_items_report.json (.jsonl with --format jsonl; see tagging_store.py)
+        docs/dev/taggable_items_delta.json (added/resolved/moved since the last run)
+
+Item kinds are scanner plugins (see audit_scanners.py) sharing one walk of
+the tree and the TypeScript symbol index (see ts_symbol_index.py). Existing
+@doc tags come from the last extract_doclets.py run where it is current, and
+are scanned otherwise. --jobs N reads files and runs the plugins on a thread
+pool; the report is the same as a sequential run's.
 """
 
 import os
-import re
+import sys
 import json
+import time
+import argparse
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Set, Optional
 
+import pathspec
+
+from audit_scanners import ScanContext, ScannerPlugin, SourceCache, create_scanners
+from doc_walk import walk_files
+from doclet_store import find_doclets_file, read_doclets
+from extract_doclets import (
+    EXTENSIONS,
+    MANIFEST_FILE,
+    extractor_fingerprint,
+    is_unchanged,
+    load_manifest,
+)
+from tagging_store import FORMATS, REPORT_BASE, RecordWriter, find_file, output_path, read_document
+from ts_symbol_index import IndexedFile, SymbolIndex
+
+# Source roots walked (once) for every scanner
+SCAN_DIRS = ["app", "components", "lib", "server"]
+
+# Files searched for existing @doc tags
+TAG_SPEC = pathspec.GitIgnoreSpec.from_lines([f"/{scan_dir}/**/*.ts*" for scan_dir in SCAN_DIRS])
+
+DELTA_FILE = "docs/dev/taggable_items_delta.json"
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+def doclet_tag(target: str, section: Optional[str]) -> str:
+    """A doclet's @doc tag as written in the source (ts_lexer.doc_tag() of its block)"""
+    return f"{target}#{section}" if section else target
+
+def item_sort_key(item: Dict):
+    return (PRIORITY_ORDER[item["priority"]], item["type"], item["name"])
+
+def item_key(item: Dict) -> str:
+    """Identity of an item across runs; its file may change"""
+    return f"{item['type']}:{item['suggested_tag']}"
+
+def load_previous_items() -> Optional[List[Dict]]:
+    """Items of the last report (either format), or None when there is no usable report"""
+    report_path = find_file(REPORT_BASE)
+    if report_path is None:
+        return None
+
+    try:
+        return read_document(report_path)["items"]
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable previous report {report_path}: {e}")
+        return None
+
+def compute_delta(previous: List[Dict], current: List[Dict]) -> Dict:
+    """
+    Compare two item lists by item_key. Keys only in `current` are added,
+    keys only in `previous` are resolved (tagged or gone), and a key whose
+    file changed is moved. When a key has several files, files present in
+    both runs are unchanged and the rest are paired up as moves before
+    counting as added/resolved.
+    """
+    def by_key(items: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+        grouped: Dict[str, Dict[str, Dict]] = {}
+        for item in items:
+            grouped.setdefault(item_key(item), {})[item["file"]] = item
+        return grouped
+
+    old_items, new_items = by_key(previous), by_key(current)
+    added: List[Dict] = []
+    resolved: List[Dict] = []
+    moved: List[Dict] = []
+    unchanged = 0
+
+    for key in sorted(old_items.keys() | new_items.keys()):
+        old = old_items.get(key, {})
+        new = new_items.get(key, {})
+
+        unchanged += len(old.keys() & new.keys())
+        only_old = [old[path] for path in sorted(old.keys() - new.keys())]
+        only_new = [new[path] for path in sorted(new.keys() - old.keys())]
+
+        while only_old and only_new:
+            item = only_new.pop(0)
+            moved.append({"item": item, "from": only_old.pop(0)["file"], "to": item["file"]})
+
+        added.extend(only_new)
+        resolved.extend(only_old)
+
+    return {
+        "added": sorted(added, key=item_sort_key),
+        "resolved": sorted(resolved, key=item_sort_key),
+        "moved": sorted(moved, key=lambda move: item_sort_key(move["item"])),
+        "unchanged": unchanged,
+    }
+
 class TaggableItemsAuditor:
     """Audits codebase for items needing documentation tags"""
 
-    def __init__(self):
+    def __init__(self, jobs: int = 1, use_cache: bool = True, fmt: str = "json"):
+        # Thread pool size for concurrent mode (1 = sequential, 0 = pool default)
+        self.jobs = jobs
+        self.use_cache = use_cache
+        self.report_file = output_path(REPORT_BASE, fmt)
+        self.cache_stats: Dict[str, int] = {}
+        self.executor: Optional[Executor] = None
         self.items: List[Dict] = []
         self.existing_tags: Set[str] = set()
+        self.scanners: List[ScannerPlugin] = create_scanners()
+        # Files from the single tree walk: those read in the source pass,
+        # those searched for @doc tags, those plugins read symbols from
+        # (always indexed), those indexed only when they contain one of a
+        # plugin's markers, and each plugin's own files
+        self.source_files: List[Path] = []
+        self.tag_files: Set[Path] = set()
+        self.symbol_files: Set[Path] = set()
+        self.marker_files: Dict[Path, Set[bytes]] = {}
+        # Tag files whose tags came from the last extraction (not scanned)
+        self.extracted_files: Set[Path] = set()
+        self.tag_source: Dict = {}
+        self.plugin_files: Dict[str, List[Path]] = {scanner.name: [] for scanner in self.scanners}
+        # Shared per-run state handed to the plugins
+        self.sources = SourceCache()
+        self.indexed_files: Dict[Path, IndexedFile] = {}
+        self.walk_stats: Dict = {}
+        self.timings: Dict[str, float] = {}
+        self.scanner_stats: Dict[str, Dict[str, int]] = {}
+        # Non-item results by plugin (e.g. env var usage)
+        self.findings: Dict[str, Dict] = {}
+
+    def collect_source_files(self):
+        """Walk the source roots once and route each file to the plugins that want it"""
+        print("📂 Walking source tree...")
+
+        stats = {"dirs": 0, "pruned": 0, "files": 0}
+        started = time.perf_counter()
+
+        # Repo-root files (e.g. .env.example) are offered to plugins too
+        root_files = sorted(Path(entry.name) for entry in os.scandir(".") if entry.is_file())
+
+        for scan_dir in SCAN_DIRS:
+            for file_path in walk_files(scan_dir, stats):
+                stats["files"] += 1
+                self.route_file(file_path)
+
+        for file_path in root_files:
+            self.route_file(file_path)
+
+        stats["seconds"] = round(time.perf_counter() - started, 4)
+        stats["routed"] = {
+            "existing_tags": len(self.tag_files),
+            **{name: len(files) for name, files in self.plugin_files.items()},
+        }
+        self.walk_stats = stats
 
-    def scan_existing_tags(self):
-        """Scan for existing @doc tags to avoid duplicates"""
-        print("🔍 Scanning for existing @doc tags...")
-
-        scan_dirs = ["app", "components", "lib", "server"]
-        tag_count = 0
-
-        for scan_dir in scan_dirs:
-            if not os.path.exists(scan_dir):
-                continue
-
-            for file_path in Path(scan_dir).rglob("*.ts*"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Find @doc: tags
-                    tags = re.findall(r'@doc:([^\s]+)', content)
-                    for tag in tags:
-                        self.existing_tags.add(tag)
-                        tag_count += 1
-
-                except Exception as e:
-                    pass  # Skip files with read errors
-
-        print(f"   Found {tag_count} existing tags ({len(self.existing_tags)} unique)")
+        print(f"   Walked {stats['files']} files in {stats['dirs']} directories "
+              f"({stats['pruned']} pruned) in {stats['seconds'] * 1000:.0f}ms")
         print()
 
-    def scan_trpc_routers(self):
-        """Scan for tRPC router procedures"""
-        print("📡 Scanning tRPC routers...")
-
-        routers_dir = Path("app/server/routers")
-
-        if not routers_dir.exists():
-            print("   ⚠️  Routers directory not found")
-            return
-
-        procedure_count = 0
-
-        for router_file in routers_dir.glob("*.ts"):
-            try:
-                with open(router_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Find export const procedureName = ...procedure.query/mutation
-                pattern = r'export const (\w+)\s*=\s*\w+\.(?:query|mutation)'
-                procedures = re.findall(pattern, content)
-
-                router_name = router_file.stem
-
-                for procedure_name in procedures:
-                    # Check if already tagged
-                    tag_target = f"api/{router_name}#{procedure_name}"
-
-                    if tag_target in self.existing_tags:
-                        continue  # Already tagged
-
-                    self.items.append({
-                        "type": "trpc_procedure",
-                        "category": "api",
-                        "file": str(router_file),
-                        "name": procedure_name,
-                        "router": router_name,
-                        "suggested_tag": tag_target,
-                        "priority": "high"
-                    })
-
-                    procedure_count += 1
-
-            except Exception as e:
-                print(f"   ⚠️  Error reading {router_file}: {e}")
-
-        print(f"   Found {procedure_count} untagged procedures")
-
-    def scan_database_tables(self):
-        """Scan for database table definitions"""
-        print("🗄️  Scanning database schema...")
-
-        schema_file = Path("lib/db/schema.ts")
-
-        if not schema_file.exists():
-            print("   ⚠️  Schema file not found")
-            return
-
-        try:
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Find export const tableName = pgTable(...)
-            pattern = r'export const (\w+)\s*=\s*pgTable\('
-            tables = re.findall(pattern, content)
-
-            table_count = 0
-
-            for table_name in tables:
-                # Check if already tagged
-                tag_target = f"db/schema#{table_name}"
-
-                if tag_target in self.existing_tags:
-                    continue
-
-                self.items.append({
-                    "type": "database_table",
-                    "category": "db",
-                    "file": str(schema_file),
-                    "name": table_name,
-                    "suggested_tag": tag_target,
-                    "priority": "medium"
-                })
-
-                table_count += 1
-
-            print(f"   Found {table_count} untagged tables")
-
-        except Exception as e:
-            print(f"   ⚠️  Error reading schema: {e}")
-
-    def scan_components(self):
-        """Scan for React components"""
-        print("🧩 Scanning components...")
+    def route_file(self, file_path: Path):
+        """Record which plugins want a file, and whether it may need indexing"""
+        needs_source = False
 
-        components_dir = Path("components")
+        if TAG_SPEC.match_file(str(file_path)):
+            self.tag_files.add(file_path)
+            needs_source = True
 
-        if not components_dir.exists():
-            print("   ⚠️  Components directory not found")
-            return
-
-        component_count = 0
-
-        for component_file in components_dir.rglob("*.tsx"):
-            # Skip node_modules and ui components (already documented)
-            if "node_modules" in component_file.parts or component_file.parts[1] == "ui":
-                continue
-
-            try:
-                with open(component_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                # Find export function ComponentName or export const ComponentName
-                pattern = r'export (?:function|const) (\w+)'
-                components = re.findall(pattern, content)
-
-                for component_name in components:
-                    # Only tag if it's a React component (starts with uppercase)
-                    if not component_name[0].isupper():
-                        continue
-
-                    # Determine category
-                    if "components/ui" in str(component_file):
-                        category = "components/ui"
+        for scanner in self.scanners:
+            if scanner.wants(file_path):
+                self.plugin_files[scanner.name].append(file_path)
+                if scanner.indexes(file_path):
+                    if scanner.index_marker is None:
+                        self.symbol_files.add(file_path)
                     else:
-                        category = "components/custom"
-
-                    # Check if already tagged
-                    tag_target = f"{category}#{component_name}"
+                        self.marker_files.setdefault(file_path, set()).add(scanner.index_marker)
+                    needs_source = True
+
+        if needs_source:
+            self.source_files.append(file_path)
+
+    def index_markers(self) -> Dict[Path, Set[bytes]]:
+        """
+        What makes each source file worth tokenizing (SymbolIndex.update()):
+        files plugins read symbols from always are, env files only when they
+        contain a marker, tag files never (only their tags are read)
+        """
+        return {
+            f: self.marker_files.get(f, set())
+            for f in self.source_files if f not in self.symbol_files
+        }
 
-                    if tag_target in self.existing_tags:
-                        continue
+    def load_extracted_tags(self):
+        """
+        Take existing tags from the last extraction for each tag file it is
+        still current for: files whose size/mtime match the extraction
+        manifest or, without a usable manifest, files older than the doclets
+        output. Only the remaining tag files are scanned.
+        """
+        print("📥 Loading existing tags from the last extraction...")
+
+        # Files extract_doclets.py scans, in walk order
+        candidates = [f for f in self.source_files if f in self.tag_files and f.suffix in EXTENSIONS]
+        tags_by_file: Dict[str, List[str]] = {}
+        source = None
+
+        if self.use_cache:
+            manifest = load_manifest(extractor_fingerprint())
+            doclets_file = find_doclets_file()
+
+            if manifest:
+                source = MANIFEST_FILE
+                for file_path in candidates:
+                    entry = manifest.get(str(file_path))
+                    if entry and is_unchanged(entry, os.stat(file_path)):
+                        tags_by_file[str(file_path)] = [
+                            doclet_tag(d.target, d.section) for d in entry["doclets"] or []
+                        ]
+            elif doclets_file:
+                source = doclets_file
+                try:
+                    output_mtime = os.stat(doclets_file).st_mtime_ns
+                    by_file: Dict[str, List[str]] = {}
+                    for doclets in read_doclets(doclets_file)["doclets"].values():
+                        for doclet in doclets:
+                            by_file.setdefault(doclet["source"]["file"], []).append(
+                                doclet_tag(doclet["target"], doclet.get("section"))
+                            )
+                    for file_path in candidates:
+                        if os.stat(file_path).st_mtime_ns <= output_mtime:
+                            tags_by_file[str(file_path)] = by_file.get(str(file_path), [])
+                except Exception as e:
+                    print(f"   ⚠️  Ignoring unreadable {doclets_file}: {e}")
+                    tags_by_file = {}
 
-                    # Only tag reusable components (not page-specific ones)
-                    # Skip if file has "page" in name
-                    if "page" in component_file.stem.lower():
-                        continue
+        tag_count = 0
+        for file_path in candidates:
+            tags = tags_by_file.get(str(file_path))
+            if tags is None:
+                continue
+            self.extracted_files.add(file_path)
+            self.existing_tags.update(tags)
+            tag_count += len(tags)
+
+        # Covered files only need reading when a plugin may read their symbols
+        self.source_files = [
+            f for f in self.source_files
+            if f in self.symbol_files or f in self.marker_files or f not in self.extracted_files
+        ]
 
-                    self.items.append({
-                        "type": "react_component",
-                        "category": category,
-                        "file": str(component_file),
-                        "name": component_name,
-                        "suggested_tag": tag_target,
-                        "priority": "low"
-                    })
+        self.tag_source = {
+            "source": source,
+            "extracted_files": len(self.extracted_files),
+            "extracted_tags": tag_count,
+            "scanned_files": len(self.tag_files) - len(self.extracted_files),
+        }
 
-                    component_count += 1
+        if source:
+            print(f"   Took {tag_count} tags for {len(self.extracted_files)} files from {source}; "
+                  f"{self.tag_source['scanned_files']} changed or unextracted files will be scanned")
+        else:
+            print("   No usable extraction output; scanning every file for tags")
+        print()
 
-            except Exception as e:
-                pass  # Skip files with errors
+    def scan_sources(self):
+        """
+        Bring the source files up to date in the symbol index, collecting
+        @doc tags. Only files a plugin reads symbols from are tokenized (see
+        index_markers()); the others are scanned for JSDoc blocks only.
+        """
+        print("🔍 Scanning sources for @doc tags and taggable items...")
 
-        print(f"   Found {component_count} untagged components")
+        tag_count = 0
+        started = time.perf_counter()
+        map_fn = self.executor.map if self.executor else map
 
-    def scan_env_vars(self):
-        """Scan for environment variables"""
-        print("🔧 Scanning environment variables...")
+        index = SymbolIndex()
+        if not self.use_cache:
+            index.clear()
 
-        env_example = Path(".env.example")
+        counts = {"unchanged": 0, "cached": 0, "parsed": 0, "skipped": 0, "error": 0}
 
-        if not env_example.exists():
-            print("   ⚠️  .env.example not found")
-            return
+        # Reads go through the shared SourceCache (and the thread pool in
+        # concurrent mode); results arrive in walk order
+        results = index.update(
+            self.source_files, read=self.sources.read, map_fn=map_fn, markers=self.index_markers()
+        )
 
         try:
-            with open(env_example, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            env_count = 0
-
-            for line in lines:
-                # Skip comments and empty lines
-                if line.strip().startswith("#") or not line.strip():
-                    continue
-
-                # Parse VAR_NAME=value
-                match = re.match(r'([A-Z_][A-Z0-9_]*)=', line)
-                if not match:
+            for file_path, status, indexed, error in results:
+                counts[status] += 1
+                if error:
+                    print(f"   ⚠️  Error reading {file_path}: {error}")
                     continue
 
-                var_name = match.group(1)
-
-                # Determine category
-                if "DATABASE" in var_name or "DB_" in var_name:
-                    category = "env/database"
-                elif "AUTH" in var_name:
-                    category = "env/auth"
-                elif "S3_" in var_name or "STORAGE" in var_name:
-                    category = "env/storage"
-                elif "SENTRY" in var_name:
-                    category = "env/sentry"
-                else:
-                    category = "env/general"
-
-                # Check if already tagged
-                tag_target = f"{category}#{var_name}"
+                self.indexed_files[file_path] = indexed
 
-                if tag_target in self.existing_tags:
-                    continue
+                if file_path in self.tag_files and file_path not in self.extracted_files:
+                    for tag, _ in indexed.tags:
+                        self.existing_tags.add(tag)
+                        tag_count += 1
 
-                self.items.append({
-                    "type": "environment_variable",
-                    "category": category,
-                    "file": str(env_example),
-                    "name": var_name,
-                    "suggested_tag": tag_target,
-                    "priority": "medium"
-                })
+            counts["removed"] = index.prune(self.source_files)
+        finally:
+            index.close()
 
-                env_count += 1
+        self.cache_stats = counts
+        self.timings["sources"] = round(time.perf_counter() - started, 4)
 
-            print(f"   Found {env_count} untagged environment variables")
+        print(f"   Found {tag_count} existing tags by scanning ({len(self.existing_tags)} unique in total)")
+        print(f"   Indexed {counts['parsed']} files, scanned {counts['skipped']} more for tags only, "
+              f"reused {counts['unchanged'] + counts['cached']} from the symbol index "
+              f"in {self.timings['sources'] * 1000:.0f}ms")
+        print()
 
-        except Exception as e:
-            print(f"   ⚠️  Error reading .env.example: {e}")
+    def run_scanners(self):
+        """
+        Run the scanner plugins (on the thread pool in concurrent mode). Output
+        and items are merged in registration order whichever plugin finishes
+        first.
+        """
+        def timed(scanner: ScannerPlugin):
+            ctx = ScanContext(
+                self.plugin_files[scanner.name], self.indexed_files, self.sources, self.existing_tags
+            )
+            log: List[str] = []
+            started = time.perf_counter()
+            items = scanner.scan(ctx, log)
+            return items, log, time.perf_counter() - started, ctx
+
+        if self.executor:
+            futures = [self.executor.submit(timed, scanner) for scanner in self.scanners]
+            results = (future.result() for future in futures)
+        else:
+            results = (timed(scanner) for scanner in self.scanners)
+
+        for scanner, (items, log, seconds, ctx) in zip(self.scanners, results):
+            print(scanner.banner)
+            for line in log:
+                print(line)
+            self.items.extend(items)
+            if ctx.findings:
+                self.findings[scanner.name] = ctx.findings
+            self.timings[scanner.name] = round(seconds, 4)
+            self.scanner_stats[scanner.name] = {
+                "files": len(self.plugin_files[scanner.name]),
+                "matches": ctx.match_count,
+                "items": len(items),
+            }
 
     def generate_report(self):
         """Generate audit report"""
@@ -301,32 +404,67 @@ class TaggableItemsAuditor:
 
         print()
 
-        # Write JSON report
+        # Write report (items are streamed to disk in the jsonl format)
         report = {
             "generated": "AUTO-GENERATED by scripts/audit_taggable_items.py",
             "total_items": len(self.items),
             "existing_tags": len(self.existing_tags),
+            "walk": self.walk_stats,
+            "jobs": self.jobs,
+            "timings": self.timings,
+            "scanners": self.scanner_stats,
+            "cache": self.cache_stats,
+            "tag_source": self.tag_source,
             "by_type": by_type,
             "by_priority": by_priority,
-            "items": sorted(self.items, key=lambda x: (
-                {"high": 0, "medium": 1, "low": 2}[x["priority"]],
-                x["type"],
-                x["name"]
-            ))
+            "findings": self.findings,
+        }
+        items = sorted(self.items, key=item_sort_key)
+
+        # Delta against the report being replaced
+        previous = load_previous_items()
+        delta = compute_delta(previous or [], items)
+        report["delta"] = {
+            "baseline": previous is not None,
+            **{key: len(value) if isinstance(value, list) else value for key, value in delta.items()},
         }
 
         os.makedirs("docs/dev", exist_ok=True)
-        output_path = "docs/dev/taggable_items_report.json"
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2)
+        with RecordWriter(self.report_file, report) as writer:
+            # jsonl readers take one file's items at a time
+            if writer.fmt == "jsonl":
+                items = sorted(items, key=lambda item: item["file"])
+            for item in items:
+                writer.write(item)
+            writer.finish({"total_items": writer.count})
 
-        print(f"✅ Report generated: {output_path}")
-        print()
+        print(f"✅ Report generated: {self.report_file}")
+
+        self.generate_delta(delta, previous)
 
         # Generate markdown summary
         self.generate_markdown_summary(report)
 
+    def generate_delta(self, delta: Dict, previous: Optional[List[Dict]]):
+        """Write the delta against the previous report as its own artifact"""
+        output = {
+            "generated": "AUTO-GENERATED by scripts/audit_taggable_items.py",
+            # False on the first run: every item counts as added
+            "baseline": previous is not None,
+            "previous_items": len(previous) if previous is not None else 0,
+            "total_items": len(self.items),
+            **delta,
+        }
+
+        with open(DELTA_FILE, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+
+        print(f"✅ Delta generated: {DELTA_FILE} "
+              f"(+{len(delta['added'])} added, -{len(delta['resolved'])} resolved, "
+              f"{len(delta['moved'])} moved)")
+        print()
+
     def generate_markdown_summary(self, report: Dict):
         """Generate markdown summary"""
         lines = [
@@ -338,6 +476,8 @@ class TaggableItemsAuditor:
             "",
             f"- **Total untagged items**: {report['total_items']}",
             f"- **Existing tags**: {report['existing_tags']}",
+            f"- **Since last run**: +{report['delta']['added']} added, "
+            f"-{report['delta']['resolved']} resolved, {report['delta']['moved']} moved",
             "",
             "## By Type",
             "",
@@ -361,6 +501,28 @@ class TaggableItemsAuditor:
             if count > 0:
                 lines.append(f"| {priority} | {count} |")
 
+        env_usage = report["findings"].get("env_vars")
+        if env_usage:
+            lines.extend([
+                "",
+                "## Environment Variable Usage",
+                "",
+                f"- **Read in code**: {env_usage['referenced']}",
+                f"- **Missing from .env.example**: {len(env_usage['undocumented'])}",
+                f"- **Declared but unused**: {len(env_usage['unused'])}",
+            ])
+
+            if env_usage["undocumented"]:
+                lines.extend(["", "| Undocumented | Category | First use |", "|--------------|----------|-----------|"])
+                for var in env_usage["undocumented"]:
+                    first = var["references"][0]
+                    lines.append(f"| `{var['name']}` | {var['category']} | `{first['file']}:{first['line']}` |")
+
+            if env_usage["unused"]:
+                lines.extend(["", "| Unused | Category |", "|--------|----------|"])
+                for var in env_usage["unused"]:
+                    lines.append(f"| `{var['name']}` | {var['category']} |")
+
         lines.extend([
             "",
             "## Next Steps",
@@ -372,7 +534,8 @@ class TaggableItemsAuditor:
             "",
             "## Details",
             "",
-            f"See full report: `docs/dev/taggable_items_report.json`",
+            f"See full report: `{self.report_file}`",
+            f"Changes since the last run: `{DELTA_FILE}`",
             "",
         ])
 
@@ -391,22 +554,62 @@ class TaggableItemsAuditor:
         print("=" * 60)
         print()
 
-        # Scan for existing tags first
-        self.scan_existing_tags()
+        if self.jobs != 1:
+            # 0 = ThreadPoolExecutor's own default bound for I/O-bound work
+            workers = self.jobs or min(32, (os.cpu_count() or 1) + 4)
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+            print(f"⚡ Concurrent mode: {workers} threads")
+            print()
 
-        # Scan for taggable items
-        self.scan_trpc_routers()
-        self.scan_database_tables()
-        self.scan_components()
-        self.scan_env_vars()
+        try:
+            # Walk the tree once, reuse extracted tags where still current,
+            # then index every remaining file once (tags and symbols together)
+            self.collect_source_files()
+            self.load_extracted_tags()
+            self.scan_sources()
+
+            # Filter candidates against existing tags
+            self.run_scanners()
+        finally:
+            if self.executor:
+                self.executor.shutdown()
 
         # Generate report
         self.generate_report()
 
         return 0
 
-def main():
-    auditor = TaggableItemsAuditor()
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Audit the codebase for items that should have @doc tags"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="read files and run scanners on N threads (0 = thread pool default; default: 1)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the symbol index and extraction output; re-tokenize and scan every file"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        default="json",
+        help="report format: json (default) or jsonl (streamed, one item per line); "
+             "generate_tagging_plan.py detects it"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    auditor = TaggableItemsAuditor(jobs=args.jobs, use_cache=not args.no_cache, fmt=args.format)
     return auditor.run()
 
 if __name__ == "__main__":
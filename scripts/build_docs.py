@@ -6,7 +6,7 @@ Reads doclets.yaml and books.yaml, then merges extracted documentation
 content into target markdown files between CODE-EXTRACT markers.
 
 Usage: python3 scripts/build_docs.py
-Requires: docs/dev/doclets.yaml, docs/books.yaml
+Requires: docs/dev/doclets.yaml (or .json / .jsonl), docs/books.yaml
 """
 
 import os
@@ -15,7 +15,8 @@ import yaml
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-DOCLETS_FILE = "docs/dev/doclets.yaml"
+from doclet_store import YamlLoader, find_doclets_file, read_doclets
+
 BOOKS_FILE = "docs/books.yaml"
 
 class DocumentBuilder:
@@ -31,20 +32,24 @@ class DocumentBuilder:
         }
 
     def load_doclets(self) -> bool:
-        """Load extracted doclets from YAML"""
-        if not os.path.exists(DOCLETS_FILE):
-            print(f"❌ Doclets file not found: {DOCLETS_FILE}")
+        """
+        Load extracted doclets (YAML, JSON or JSON Lines). From a sharded
+        layout only the targets mapped in books.yaml are read, so
+        load_targets() must run first.
+        """
+        doclets_file = find_doclets_file()
+        if not doclets_file:
+            print("❌ Doclets file not found: docs/dev/doclets.yaml")
             print("   Run: pnpm docs:extract")
             return False
 
         try:
-            with open(DOCLETS_FILE, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                self.doclets = data.get("doclets", {})
-                print(f"✅ Loaded {len(self.doclets)} target(s) from doclets.yaml")
-                return True
+            data = read_doclets(doclets_file, targets=self.targets.keys())
+            self.doclets = data.get("doclets", {})
+            print(f"✅ Loaded {len(self.doclets)} target(s) from {os.path.basename(doclets_file)}")
+            return True
         except Exception as e:
-            print(f"❌ Error loading {DOCLETS_FILE}: {e}")
+            print(f"❌ Error loading {doclets_file}: {e}")
             return False
 
     def load_targets(self) -> bool:
@@ -55,7 +60,7 @@ class DocumentBuilder:
 
         try:
             with open(BOOKS_FILE, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 self.targets = data.get("targets", {})
                 print(f"✅ Loaded {len(self.targets)} target mapping(s) from books.yaml")
                 return True
@@ -215,11 +220,11 @@ def main():
 
     builder = DocumentBuilder()
 
-    # Load inputs
-    if not builder.load_doclets():
-        return 1
+    # Load inputs (targets first: they select which doclet shards to read)
     if not builder.load_targets():
         return 1
+    if not builder.load_doclets():
+        return 1
 
     # Build documentation
     if not builder.build():
@@ -13,9 +13,10 @@ import re
 import sys
 import json
 import hashlib
-from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+from doc_walk import walk_files
+
 # Default drift threshold (5% content change)
 DEFAULT_THRESHOLD = 0.05
 
@@ -236,16 +237,12 @@ class DriftChecker:
         if not self.load_repo_facts():
             return 1
 
-        # Find all markdown files
-        docs_root = Path("docs")
-        md_files = []
-
-        for ext in [".md"]:
-            for file_path in docs_root.rglob(f"*{ext}"):
-                # Skip archived and generated files
-                if ".archive" in file_path.parts or "node_modules" in file_path.parts:
-                    continue
-                md_files.append(str(file_path))
+        # Find all markdown files (archived, ignored and node_modules
+        # directories are pruned during the walk)
+        md_files = [
+            str(file_path) for file_path in walk_files("docs")
+            if file_path.suffix == ".md"
+        ]
 
         print(f"📁 Scanning {len(md_files)} markdown files...")
         print()
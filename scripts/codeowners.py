@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+CODEOWNERS Matcher
+
+Resolves the owners of repo paths from the CODEOWNERS file, with GitHub's
+semantics: gitignore-style patterns, the last matching line wins, and a
+pattern without owners leaves its paths unowned.
+
+Rules are compiled once and indexed so a lookup never scans every line:
+
+- anchored patterns (a "/" anywhere but the end) sit in a trie keyed by
+  their literal leading path segments, so a path only meets the rules on
+  its own branch (e.g. /lib/db/schema.ts is only tried for that path)
+- floating patterns (no "/", e.g. *.md, *.test.ts, Dockerfile) are indexed
+  by literal name or extension, checked against each component of the path
+  (a.test.ts is looked up under .test.ts and .ts)
+
+Candidates are then confirmed against their compiled pattern, highest line
+first. The file is looked up where GitHub looks for it: .github/,
+the repo root, then docs/.
+
+Usage (inspect paths): python3 scripts/codeowners.py PATH [PATH ...]
+"""
+
+import os
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+import pathspec
+
+CODEOWNERS_LOCATIONS = [".github/CODEOWNERS", "CODEOWNERS", "docs/CODEOWNERS"]
+
+GLOB_CHARS = re.compile(r"[*?\[\\]")
+
+class Rule(NamedTuple):
+    line: int
+    pattern: str
+    owners: List[str]
+    spec: pathspec.PathSpec
+
+class _Node:
+    __slots__ = ("children", "rules")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.rules: List[Rule] = []
+
+def find_codeowners() -> Optional[str]:
+    """The CODEOWNERS file GitHub would use, or None"""
+    for path in CODEOWNERS_LOCATIONS:
+        if os.path.isfile(path):
+            return path
+    return None
+
+class CodeOwners:
+    """Compiled CODEOWNERS rules"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.rules: List[Rule] = []
+        self._root = _Node()
+        self._by_name: Dict[str, List[Rule]] = {}
+        self._by_ext: Dict[str, List[Rule]] = {}
+        self._floating: List[Rule] = []
+
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    self._add(line_number, line)
+
+    @classmethod
+    def load(cls) -> "CodeOwners":
+        """Rules from the repo's CODEOWNERS (no rules when there is none)"""
+        return cls(find_codeowners())
+
+    def _add(self, line_number: int, line: str):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return
+
+        pattern, *owners = line.split()
+        # Inline comments end the owner list
+        for i, owner in enumerate(owners):
+            if owner.startswith("#"):
+                owners = owners[:i]
+                break
+
+        rule = Rule(line_number, pattern, owners, pathspec.GitIgnoreSpec.from_lines([pattern]))
+        self.rules.append(rule)
+
+        if "/" in pattern.rstrip("/"):
+            # Anchored: index by the literal leading segments
+            node = self._root
+            for segment in pattern.strip("/").split("/"):
+                if GLOB_CHARS.search(segment):
+                    break
+                node = node.children.setdefault(segment, _Node())
+            node.rules.append(rule)
+            return
+
+        name = pattern.rstrip("/")
+        if not GLOB_CHARS.search(name):
+            self._by_name.setdefault(name, []).append(rule)
+        elif name.startswith("*.") and not GLOB_CHARS.search(name[2:]):
+            self._by_ext.setdefault(name[1:], []).append(rule)
+        else:
+            self._floating.append(rule)
+
+    def _candidates(self, path: str) -> List[Rule]:
+        segments = path.split("/")
+        candidates = list(self._floating)
+
+        node = self._root
+        candidates.extend(node.rules)
+        for segment in segments:
+            node = node.children.get(segment)
+            if node is None:
+                break
+            candidates.extend(node.rules)
+
+        for segment in segments:
+            candidates.extend(self._by_name.get(segment, ()))
+            # Every dotted suffix, so *.test.ts and *.d.ts are found as well as *.ts
+            for i, char in enumerate(segment):
+                if char == ".":
+                    candidates.extend(self._by_ext.get(segment[i:], ()))
+
+        return candidates
+
+    def rule_for(self, path: str) -> Optional[Rule]:
+        """The CODEOWNERS line deciding a path's owners (last match wins)"""
+        path = path.replace(os.sep, "/")
+        if path.startswith("./"):
+            path = path[2:]
+        for rule in sorted(self._candidates(path), key=lambda r: r.line, reverse=True):
+            if rule.spec.match_file(path):
+                return rule
+        return None
+
+    def owners(self, path: str) -> List[str]:
+        """Owners of a repo-relative path (empty when unowned)"""
+        rule = self.rule_for(path)
+        return list(rule.owners) if rule else []
+
+def main(argv: Optional[List[str]] = None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("Usage: python3 scripts/codeowners.py PATH [PATH ...]")
+        return 1
+
+    codeowners = CodeOwners.load()
+    if not codeowners.path:
+        print("⚠️  No CODEOWNERS file found")
+        return 1
+
+    print(f"📋 {codeowners.path} ({len(codeowners.rules)} rules)")
+    for path in paths:
+        rule = codeowners.rule_for(path)
+        if rule is None:
+            print(f"   {path}: unowned (no matching rule)")
+        else:
+            owners = " ".join(rule.owners) or "unowned"
+            print(f"   {path}: {owners} (line {rule.line}: {rule.pattern})")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
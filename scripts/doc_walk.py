@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Doc Pipeline Tree Walker
+
+Shared directory walker for the documentation scripts (extract_doclets.py,
+audit_taggable_items.py, fix_doc_links.py, check_doc_drift.py).
+
+Ignore rules are compiled once per directory with pathspec and applied
+before descending, so ignored trees (build output, caches, vendored code)
+are never listed:
+
+- .gitignore files at the repo root and in any walked directory, with git's
+  relative-to-the-file semantics
+- .docsignore at the repo root: same syntax, for paths that are tracked but
+  should stay out of the doc pipeline
+- PRUNE_DIRS and hidden directories, which are always skipped, and
+  ROOT_PRUNE_DIRS, the build output directories at the repo root (an
+  app/ route segment named build is still walked)
+
+Paths are relative to the current directory, which must be the repo root
+(as for every docs script).
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pathspec
+
+IGNORE_FILE = ".gitignore"
+DOCS_IGNORE_FILE = ".docsignore"
+
+# Directories never descended into, even when not gitignored
+PRUNE_DIRS = {"node_modules", ".next"}
+
+# Build output at the repo root; directories with these names elsewhere are walked
+ROOT_PRUNE_DIRS = {"build", "dist", "out", "coverage"}
+
+# (directory the rules are relative to, compiled rules)
+Rules = Tuple[str, pathspec.PathSpec]
+
+_spec_cache: Dict[str, Optional[pathspec.PathSpec]] = {}
+
+def _load_spec(path: str) -> Optional[pathspec.PathSpec]:
+    """Compile an ignore file once per run; None when it does not exist"""
+    if path not in _spec_cache:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _spec_cache[path] = pathspec.GitIgnoreSpec.from_lines(f)
+        except OSError:
+            _spec_cache[path] = None
+    return _spec_cache[path]
+
+def _dir_rules(directory: str) -> List[Rules]:
+    """Rules contributed by the ignore file(s) in one directory"""
+    rules = []
+    names = [IGNORE_FILE, DOCS_IGNORE_FILE] if directory == "." else [IGNORE_FILE]
+
+    for name in names:
+        spec = _load_spec(os.path.join(directory, name))
+        if spec:
+            rules.append((directory, spec))
+
+    return rules
+
+def _root_rules(root: str) -> List[Rules]:
+    """Rules from the repo root down to (and including) the walk root"""
+    rules = _dir_rules(".")
+    parts = Path(os.path.normpath(root)).parts
+
+    for depth in range(1, len(parts) + 1):
+        directory = os.path.join(*parts[:depth])
+        if directory != ".":
+            rules.extend(_dir_rules(directory))
+
+    return rules
+
+def is_ignored(path: str, is_dir: bool, rules: List[Rules]) -> bool:
+    """Check a path against the active rules (last matching rule wins, as in git)"""
+    ignored = False
+
+    for base, spec in rules:
+        rel_path = path if base == "." else os.path.relpath(path, base)
+        if is_dir:
+            rel_path += "/"
+        result = spec.check_file(rel_path)
+        if result.include is not None:
+            ignored = result.include
+
+    return ignored
+
+def walk_files(root: str, stats: Optional[Dict[str, int]] = None) -> Iterator[Path]:
+    """
+    Yield files under root (sorted per directory), skipping ignored files and
+    pruning ignored, PRUNE_DIRS, ROOT_PRUNE_DIRS and hidden directories
+    before descending.
+
+    When given, stats accumulates "dirs" visited and "pruned" directories.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault("dirs", 0)
+    stats.setdefault("pruned", 0)
+
+    root = os.path.normpath(root)
+    if not os.path.isdir(root):
+        return
+
+    yield from _walk(root, _root_rules(root), stats)
+
+def _walk(directory: str, rules: List[Rules], stats: Dict[str, int]) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+
+    stats["dirs"] += 1
+
+    for entry in entries:
+        path = os.path.normpath(entry.path)
+
+        if entry.is_dir(follow_symlinks=False):
+            if (
+                entry.name in PRUNE_DIRS
+                or path in ROOT_PRUNE_DIRS
+                or entry.name.startswith(".")
+                or is_ignored(path, True, rules)
+            ):
+                stats["pruned"] += 1
+                continue
+            yield from _walk(path, rules + _dir_rules(path), stats)
+        elif entry.is_file() and not is_ignored(path, False, rules):
+            yield Path(path)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Doclet Store
+
+Reads and writes the doclets hand-off file shared by extract_doclets.py and
+build_docs.py. Three formats are supported:
+
+- yaml:  docs/dev/doclets.yaml (default; LibYAML C dumper/loader when available)
+- json:  docs/dev/doclets.json (single document, same structure as the YAML)
+- jsonl: docs/dev/doclets.jsonl (header record, then one doclet per line)
+
+Readers detect the format from the file extension, falling back to
+sniffing the content, so either stage can switch formats independently.
+
+Any format can also be written sharded: one file per target under
+docs/dev/doclets/ plus a small index.json (target -> file, count, sha256).
+Readers that only need some targets load just those shards, and unchanged
+targets keep their files (and mtimes) untouched between runs.
+"""
+
+import os
+import json
+import hashlib
+import yaml
+from urllib.parse import quote
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import store_formats
+from store_formats import latest_file
+
+DOCLETS_BASE = "docs/dev/doclets"
+SHARD_DIR = "docs/dev/doclets"
+SHARD_INDEX = "index.json"
+
+FORMATS = {
+    "yaml": ".yaml",
+    "json": ".json",
+    "jsonl": ".jsonl",
+}
+
+# LibYAML bindings are an order of magnitude faster; output is identical
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+JSONL_HEADER_KEY = "doclets_jsonl"
+
+def output_path(fmt: str, base: str = DOCLETS_BASE) -> str:
+    """Default output path for a format"""
+    return store_formats.output_path(base, fmt, FORMATS)
+
+def find_doclets_file(base: str = DOCLETS_BASE, shard_dir: str = SHARD_DIR) -> Optional[str]:
+    """
+    Locate the doclets file (or shard index) written by the last extraction.
+    When several formats or layouts exist, the most recently written one wins.
+    """
+    candidates = [base + ext for ext in FORMATS.values()]
+    candidates.append(os.path.join(shard_dir, SHARD_INDEX))
+    return latest_file(candidates)
+
+def is_shard_index(path: str) -> bool:
+    """True when path points at a sharded layout's index rather than a doclets file"""
+    return os.path.basename(path) == SHARD_INDEX
+
+def detect_format(path: str) -> str:
+    """Detect the format of a doclets file from its extension or content"""
+    if path.endswith(".yml"):
+        return "yaml"
+    return store_formats.detect_format(path, FORMATS, JSONL_HEADER_KEY, fallback="yaml")
+
+def _as_dict(doclet: Any) -> Dict[str, Any]:
+    """Doclets may be plain dicts or objects with to_dict() (extract_doclets.Doclet)"""
+    return doclet if isinstance(doclet, dict) else doclet.to_dict()
+
+def _dump_yaml(data: Any) -> str:
+    return yaml.dump(
+        data, Dumper=YamlDumper,
+        default_flow_style=False, allow_unicode=True, sort_keys=False
+    )
+
+def _node_events(dumper: Any, node: yaml.Node) -> Iterator[yaml.Event]:
+    """Serialize a representation node into events (yaml.Serializer without anchors)"""
+    if isinstance(node, yaml.ScalarNode):
+        detected = dumper.resolve(yaml.ScalarNode, node.value, (True, False))
+        default = dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+        implicit = (node.tag == detected, node.tag == default)
+        yield yaml.ScalarEvent(None, node.tag, implicit, node.value, style=node.style)
+    elif isinstance(node, yaml.SequenceNode):
+        implicit = node.tag == dumper.resolve(yaml.SequenceNode, node.value, True)
+        yield yaml.SequenceStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+        for item in node.value:
+            yield from _node_events(dumper, item)
+        yield yaml.SequenceEndEvent()
+    else:
+        implicit = node.tag == dumper.resolve(yaml.MappingNode, node.value, True)
+        yield yaml.MappingStartEvent(None, node.tag, implicit, flow_style=node.flow_style)
+        for key, value in node.value:
+            yield from _node_events(dumper, key)
+            yield from _node_events(dumper, value)
+        yield yaml.MappingEndEvent()
+
+def _write_yaml_streaming(f: TextIO, output: Dict[str, Any]):
+    """
+    Emit the output document one target at a time.
+
+    Produces exactly what yaml.dump(output) would, but only one target's
+    doclets are ever converted to dicts and representation nodes at once.
+    """
+    dumper = YamlDumper(f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+    def emit_data(data: Any):
+        for event in _node_events(dumper, dumper.represent_data(data)):
+            dumper.emit(event)
+        # Same reset yaml.Representer.represent() does after each document
+        dumper.represented_objects = {}
+        dumper.object_keeper = []
+        dumper.alias_key = None
+
+    def emit_mapping_start():
+        dumper.emit(yaml.MappingStartEvent(None, "tag:yaml.org,2002:map", True, flow_style=False))
+
+    try:
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(explicit=False))
+        emit_mapping_start()
+
+        for key, value in output.items():
+            emit_data(key)
+            if key != "doclets":
+                emit_data(value)
+                continue
+
+            emit_mapping_start()
+            for target, doclets in value.items():
+                emit_data(target)
+                emit_data([_as_dict(d) for d in doclets])
+            dumper.emit(yaml.MappingEndEvent())
+
+        dumper.emit(yaml.MappingEndEvent())
+        dumper.emit(yaml.DocumentEndEvent(explicit=False))
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+def write_doclets(path: str, output: Dict[str, Any], fmt: Optional[str] = None):
+    """
+    Write extraction output ({generated, total_tags, targets, doclets}) to path.
+    Doclets are converted to dicts one at a time (one target at a time for
+    YAML) as they are written.
+    """
+    fmt = fmt or detect_format(path)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == "yaml":
+            _write_yaml_streaming(f, output)
+        elif fmt == "json":
+            json.dump(output, f, indent=2, ensure_ascii=False, default=_as_dict)
+            f.write("\n")
+        elif fmt == "jsonl":
+            header = {key: value for key, value in output.items() if key != "doclets"}
+            header[JSONL_HEADER_KEY] = 1
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            for doclets in output["doclets"].values():
+                for doclet in doclets:
+                    f.write(json.dumps(_as_dict(doclet), ensure_ascii=False) + "\n")
+        else:
+            raise ValueError(f"Unknown doclets format: {fmt}")
+
+def shard_file_name(target: str, fmt: str) -> str:
+    """File name for a target's shard (targets contain "/" and "#")"""
+    return quote(target, safe="") + FORMATS[fmt]
+
+def serialize_shard(doclets: List[Any], fmt: str) -> str:
+    """Serialize one target's doclets"""
+    doclets = [_as_dict(d) for d in doclets]
+    if fmt == "yaml":
+        return _dump_yaml(doclets)
+    if fmt == "json":
+        return json.dumps(doclets, indent=2, ensure_ascii=False) + "\n"
+    return "".join(json.dumps(doclet, ensure_ascii=False) + "\n" for doclet in doclets)
+
+def parse_shard(text: str, fmt: str) -> List[Dict[str, Any]]:
+    """Parse one target's doclets"""
+    if fmt == "yaml":
+        return yaml.load(text, Loader=YamlLoader) or []
+    if fmt == "json":
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def write_sharded(output: Dict[str, Any], fmt: str, shard_dir: str = SHARD_DIR) -> Dict[str, int]:
+    """
+    Write one shard per target plus index.json.
+
+    Shards whose content hash is unchanged are not rewritten, and shards for
+    targets that disappeared are removed. Returns written/unchanged/removed
+    shard counts.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    index_path = os.path.join(shard_dir, SHARD_INDEX)
+
+    previous: Dict[str, Any] = {}
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get("shards", {})
+        except ValueError:
+            previous = {}
+
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+    shards: Dict[str, Dict[str, Any]] = {}
+
+    for target, doclets in output["doclets"].items():
+        body = serialize_shard(doclets, fmt).encode('utf-8')
+        entry = {
+            "file": shard_file_name(target, fmt),
+            "count": len(doclets),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+        shards[target] = entry
+
+        shard_path = os.path.join(shard_dir, entry["file"])
+        if previous.get(target) == entry and os.path.exists(shard_path):
+            stats["unchanged"] += 1
+            continue
+
+        with open(shard_path, 'wb') as f:
+            f.write(body)
+        stats["written"] += 1
+
+    live_files = {entry["file"] for entry in shards.values()}
+    for entry in previous.values():
+        stale_path = os.path.join(shard_dir, entry.get("file", ""))
+        if entry.get("file") and entry["file"] not in live_files and os.path.exists(stale_path):
+            os.remove(stale_path)
+            stats["removed"] += 1
+
+    index = {key: value for key, value in output.items() if key != "doclets"}
+    index["format"] = fmt
+    index["shards"] = shards
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+    return stats
+
+def read_sharded(index_path: str, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read a sharded layout. When `targets` is given only those shards are
+    loaded; the rest of the index (names, counts, hashes) is still returned
+    under "shards".
+    """
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    shard_dir = os.path.dirname(index_path)
+    fmt = index["format"]
+    wanted = index["shards"].keys() if targets is None else targets
+
+    by_target: Dict[str, List[Dict[str, Any]]] = {}
+    for target in sorted(set(wanted)):
+        entry = index["shards"].get(target)
+        if not entry:
+            continue
+        with open(os.path.join(shard_dir, entry["file"]), 'r', encoding='utf-8') as f:
+            by_target[target] = parse_shard(f.read(), fmt)
+
+    index["doclets"] = by_target
+    return index
+
+def read_doclets(path: str, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read a doclets file in any supported format, or a shard index.
+    Returns the extraction output structure with doclets grouped by target.
+    `targets` limits which shards are loaded from a sharded layout; it is
+    ignored for single-file layouts.
+    """
+    if is_shard_index(path):
+        return read_sharded(path, targets)
+
+    fmt = detect_format(path)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if fmt == "yaml":
+            return yaml.load(f, Loader=YamlLoader) or {}
+
+        if fmt == "json":
+            return json.load(f)
+
+        header = json.loads(f.readline())
+        header.pop(JSONL_HEADER_KEY, None)
+
+        by_target: Dict[str, List[Dict[str, Any]]] = {}
+        for line in f:
+            if not line.strip():
+                continue
+            doclet = json.loads(line)
+            by_target.setdefault(doclet["target"], []).append(doclet)
+
+    header["doclets"] = by_target
+    return header
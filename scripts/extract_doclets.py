@@ -5,15 +5,53 @@ Documentation Tag Extractor
 Scans all TypeScript/TSX files for @doc:path#section tags and extracts
 documentation content into docs/dev/doclets.yaml.
 
-Usage: python3 scripts/extract_doclets.py
-Output: docs/dev/doclets.yaml
+Only files whose size, mtime or content hash changed since the previous run
+are re-parsed; doclets for unchanged files are reused from a per-file
+manifest kept in .cache/docs-pipeline/.
+
+Usage: python3 scripts/extract_doclets.py [--no-cache] [--jobs N]
+                                         [--format yaml|json|jsonl] [--shard]
+       python3 scripts/extract_doclets.py --since origin/main
+       python3 scripts/extract_doclets.py --rev v1.2.0 [--output PATH]
+Output: docs/dev/doclets.yaml (or doclets.json / doclets.jsonl),
+        or docs/dev/doclets/<target>.* plus index.json with --shard
 """
 
 import os
 import re
-import yaml
+import sys
+import json
+import time
+import mmap
+import hashlib
+import argparse
+import subprocess
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from doc_walk import walk_files
+import ts_lexer
+from fingerprints import source_fingerprint
+from ts_lexer import decode_source, iter_doc_comments
+from doclet_store import (
+    FORMATS,
+    SHARD_DIR,
+    SHARD_INDEX,
+    detect_format,
+    find_doclets_file,
+    is_shard_index,
+    output_path as doclets_output_path,
+    read_doclets,
+    write_doclets,
+    write_sharded,
+)
 
 # Directories to scan for doc tags
 SCAN_DIRS = [
@@ -26,14 +64,34 @@ SCAN_DIRS = [
 # File extensions to process
 EXTENSIONS = [".ts", ".tsx"]
 
+# Incremental manifest location
+MANIFEST_FILE = ".cache/docs-pipeline/doclets-manifest.json"
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
 # Regex patterns
 DOC_TAG_PATTERN = re.compile(r'@doc:([^\s]+)(?:#([^\s]+))?')
 DOC_SUMMARY_PATTERN = re.compile(r'@doc-summary\s+(.+)')
 DOC_AUDIENCE_PATTERN = re.compile(r'@doc-audience\s+(.+)')
 DOC_TAGS_PATTERN = re.compile(r'@doc-tags\s+(.+)')
 
+# Byte-level prefilter: files without this never get decoded or lexed
+DOC_TAG_BYTES = b"@doc:"
+
 class Doclet:
-    """Represents a single documentation tag extraction"""
+    """
+    Represents a single documentation tag extraction.
+
+    Slotted (no per-instance __dict__): this is the only in-memory copy of a
+    doclet, shared by the manifest and the by-target grouping, and is turned
+    into a dict only while being serialized.
+    """
+
+    __slots__ = (
+        "file_path", "line_number", "target", "section",
+        "summary", "audience", "tags", "content",
+    )
 
     def __init__(self, file_path: str, line_number: int):
         self.file_path = file_path
@@ -60,38 +118,23 @@ class Doclet:
             "content": self.content.strip()
         }
 
-def extract_doc_comment(lines: List[str], start_idx: int) -> Optional[str]:
-    """
-    Extract JSDoc comment content starting from start_idx.
-    Returns the comment content without /** and */ markers.
-    """
-    if not lines[start_idx].strip().startswith("/**"):
-        return None
-
-    comment_lines = []
-    idx = start_idx
-
-    while idx < len(lines):
-        line = lines[idx].strip()
-
-        # Remove leading /** or *
-        if line.startswith("/**"):
-            line = line[3:].strip()
-        elif line.startswith("*"):
-            line = line[1:].strip()
-
-        # Check for end of comment
-        if "*/" in line:
-            # Add content before */
-            before_end = line.split("*/")[0].strip()
-            if before_end:
-                comment_lines.append(before_end)
-            break
-
-        comment_lines.append(line)
-        idx += 1
-
-    return "\n".join(comment_lines)
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Doclet":
+        """Rebuild a Doclet from its to_dict() form (e.g. from the manifest)"""
+        doclet = cls(data["source"]["file"], data["source"]["line"])
+        doclet.target = data["target"]
+        doclet.section = data["section"]
+        doclet.summary = data["summary"]
+        doclet.audience = data["audience"]
+        doclet.tags = data["tags"]
+        doclet.content = data["content"]
+        return doclet
+
+def _manifest_object_hook(data: Dict[str, Any]) -> Any:
+    """json object_hook: turn doclet dicts into Doclets while the manifest is parsed"""
+    if "target" in data and "source" in data:
+        return Doclet.from_dict(data)
+    return data
 
 def parse_doclet(comment_content: str, file_path: str, line_number: int) -> Optional[Doclet]:
     """
@@ -145,98 +188,577 @@ def parse_doclet(comment_content: str, file_path: str, line_number: int) -> Opti
 
     return doclet
 
-def scan_file(file_path: str) -> List[Doclet]:
+def scan_text(text: str, file_path: str) -> List[Doclet]:
     """
-    Scan a single TypeScript file for @doc tags.
+    Scan TypeScript source text for @doc tags.
     Returns list of Doclets found.
     """
     doclets = []
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        for i, line in enumerate(lines):
-            if line.strip().startswith("/**"):
-                # Extract full JSDoc comment
-                comment_content = extract_doc_comment(lines, i)
-                if comment_content:
-                    # Parse for @doc tags
-                    doclet = parse_doclet(comment_content, file_path, i + 1)
-                    if doclet:
-                        doclets.append(doclet)
+    for line_number, comment_content in iter_doc_comments(text):
+        # Parse for @doc tags
+        doclet = parse_doclet(comment_content, file_path, line_number)
+        if doclet:
+            doclets.append(doclet)
+
+    return doclets
+
+def list_source_files(base_dir: str) -> List[str]:
+    """
+    List TypeScript files under base_dir in a stable (sorted) order, so a
+    cached run visits files exactly as a full run would. Gitignored,
+    .docsignore'd and build/dependency directories are never descended into.
+    """
+    files = [
+        str(file_path) for file_path in walk_files(base_dir)
+        if file_path.suffix in EXTENSIONS
+    ]
+    return sorted(files)
+
+def extractor_fingerprint() -> str:
+    """Fingerprint of the manifest: this script and the lexer (see fingerprints.py)"""
+    return source_fingerprint(__file__, ts_lexer.__file__)
 
+def load_manifest(fingerprint: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load per-file fingerprints and doclets from the previous run.
+    Returns an empty manifest when missing, unreadable or out of date.
+    """
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f, object_hook=_manifest_object_hook)
     except Exception as e:
-        print(f"⚠️  Error reading {file_path}: {e}")
+        print(f"⚠️  Ignoring unreadable manifest {MANIFEST_FILE}: {e}")
+        return {}
 
-    return doclets
+    if data.get("version") != MANIFEST_VERSION or data.get("extractor") != fingerprint:
+        return {}
+
+    return data.get("files", {})
+
+def save_manifest(files: Dict[str, Dict[str, Any]], fingerprint: str):
+    """Persist per-file fingerprints and doclets for the next run"""
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "extractor": fingerprint,
+        "files": files
+    }
+
+    tmp_path = f"{MANIFEST_FILE}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(",", ":"), default=Doclet.to_dict)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def is_unchanged(cached: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    """True when size and mtime match the cached entry (file need not be read)"""
+    return bool(cached) and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns
 
-def scan_directory(base_dir: str) -> List[Doclet]:
+def scan_file_entry(file_path: str, cached_sha256: Optional[str]) -> Tuple[Dict[str, Any], str]:
+    """
+    Read, hash and (if needed) parse a file whose size or mtime changed.
+
+    The file is memory-mapped and searched for DOC_TAG_BYTES before anything
+    is decoded; files without it are hashed but never decoded or lexed.
+
+    Returns the new manifest entry and a status: "cached" when the content
+    hash still matches `cached_sha256` (e.g. after a touch or checkout; the
+    entry's doclets are left as None for the caller to reuse), "skipped"
+    when the prefilter ruled the file out, or "parsed".
+    """
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+        try:
+            entry: Dict[str, Any] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "doclets": None,
+            }
+
+            if entry["sha256"] == cached_sha256:
+                return entry, "cached"
+
+            if data.find(DOC_TAG_BYTES) == -1:
+                entry["doclets"] = []
+                return entry, "skipped"
+
+            raw = data[:]
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    try:
+        text = decode_source(raw)
+        doclets = scan_text(text, file_path)
+    except Exception as e:
+        print(f"⚠️  Error reading {file_path}: {e}")
+        doclets = []
+
+    entry["doclets"] = doclets
+    return entry, "parsed"
+
+def _scan_worker(task: Tuple[str, Optional[str]]) -> Tuple[Dict[str, Any], str, int, float]:
+    """Process-pool entry point: scan one file and report who did it and how long it took"""
+    file_path, cached_sha256 = task
+    started = time.perf_counter()
+    entry, status = scan_file_entry(file_path, cached_sha256)
+    return entry, status, os.getpid(), time.perf_counter() - started
+
+def scan_directory(
+    base_dir: str,
+    previous: Dict[str, Dict[str, Any]],
+    manifest: Dict[str, Dict[str, Any]],
+    by_target: Dict[str, List[Doclet]],
+    executor: Optional[ProcessPoolExecutor] = None,
+    worker_stats: Optional[Dict[int, List[float]]] = None
+) -> Tuple[int, Counter]:
     """
     Recursively scan directory for TypeScript files with @doc tags.
+
+    Files that changed since the previous run are scanned on `executor` when
+    given (in-process otherwise); results are merged back in file order, so
+    the output is identical to a serial run. Manifest entries for every
+    visited file are recorded in `manifest`, doclets are appended to
+    `by_target` as each file is merged, and per-worker [files, seconds]
+    totals of pool workers are added to `worker_stats`.
+
+    Returns the number of doclets found and per-status file counts
+    ("unchanged" plus the statuses from scan_file_entry).
     """
-    all_doclets = []
-    base_path = Path(base_dir)
+    tag_count = 0
+    counts: Counter = Counter()
 
-    if not base_path.exists():
+    if not Path(base_dir).exists():
         print(f"⚠️  Directory not found: {base_dir}")
-        return all_doclets
+        return tag_count, counts
+
+    files = list_source_files(base_dir)
+    tasks = []
+
+    for file_path in files:
+        cached = previous.get(file_path)
+        if is_unchanged(cached, os.stat(file_path)):
+            manifest[file_path] = cached
+            counts["unchanged"] += 1
+        else:
+            tasks.append((file_path, cached["sha256"] if cached else None))
+
+    if executor and len(tasks) > 1:
+        # Small chunks keep workers balanced; capped to limit IPC round trips
+        chunksize = min(16, max(1, len(tasks) // ((os.cpu_count() or 1) * 4)))
+        results = executor.map(_scan_worker, tasks, chunksize=chunksize)
+    else:
+        results = map(_scan_worker, tasks)
+
+    for (file_path, _), (entry, status, pid, elapsed) in zip(tasks, results):
+        if entry["doclets"] is None:
+            entry["doclets"] = previous[file_path]["doclets"]
+        manifest[file_path] = entry
+        counts[status] += 1
+
+        if worker_stats is not None and pid != os.getpid():
+            totals = worker_stats.setdefault(pid, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+    for file_path in files:
+        doclets = manifest[file_path]["doclets"]
+        if doclets:
+            for doclet in doclets:
+                by_target.setdefault(doclet.target, []).append(doclet)
+            tag_count += len(doclets)
+            print(f"   Found {len(doclets)} tag(s) in {file_path}")
+
+    return tag_count, counts
+
+def write_output(
+    output: Dict[str, Any],
+    fmt: str,
+    shard: bool
+) -> Tuple[str, Optional[Dict[str, int]]]:
+    """Write output as a single file or as shards; returns (path, shard stats)"""
+    if shard:
+        return os.path.join(SHARD_DIR, SHARD_INDEX), write_sharded(output, fmt)
+
+    # Ensure output directory exists
+    output_path = doclets_output_path(fmt)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    write_doclets(output_path, output, fmt)
+    return output_path, None
+
+def git_changed_files(rev: str) -> Tuple[List[str], List[str]]:
+    """
+    Ask git (one call) which TypeScript files under SCAN_DIRS differ between
+    REV and the working tree. Returns (modified_or_added, deleted).
+    """
+    result = subprocess.run(
+        ["git", "diff", "--name-status", "--no-renames", "-z", rev, "--", *SCAN_DIRS],
+        capture_output=True, text=True, check=True
+    )
+
+    fields = result.stdout.split("\0")
+    changed, deleted = [], []
+
+    for status, path in zip(fields[0::2], fields[1::2]):
+        if not path.endswith(tuple(EXTENSIONS)):
+            continue
+        (deleted if status == "D" else changed).append(path)
+
+    return sorted(changed), sorted(deleted)
+
+def doclet_order_key(doclet: Any) -> Tuple[int, str, int]:
+    """Order of a doclet within its target in a full run: scan dir, path, line"""
+    if isinstance(doclet, Doclet):
+        file_path, line_number = doclet.file_path, doclet.line_number
+    else:
+        file_path, line_number = doclet["source"]["file"], doclet["source"]["line"]
+
+    top_dir = file_path.split("/", 1)[0]
+    dir_index = SCAN_DIRS.index(top_dir) if top_dir in SCAN_DIRS else len(SCAN_DIRS)
+    return dir_index, file_path, line_number
 
-    # Find all TS/TSX files
-    for ext in EXTENSIONS:
-        for file_path in base_path.rglob(f"*{ext}"):
-            doclets = scan_file(str(file_path))
+def extract_since(rev: str, fmt: Optional[str]) -> int:
+    """
+    Patch the existing doclets output with files changed since `rev`.
+
+    Doclets from changed and deleted files are dropped, changed files are
+    re-scanned, and each affected target is re-sorted into full-run order,
+    so the result matches what a full extraction would produce.
+    """
+    print(f"🔍 Re-extracting @doc tags changed since {rev}...\n")
+
+    existing_path = find_doclets_file()
+    if not existing_path:
+        print("❌ No existing doclets output to patch - run a full extraction first")
+        return 1
+
+    try:
+        changed, deleted = git_changed_files(rev)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", "") or str(e)
+        print(f"❌ git diff against {rev} failed: {stderr.strip()}")
+        return 1
+
+    print(f"📄 {len(changed)} changed and {len(deleted)} deleted file(s)")
+
+    data = read_doclets(existing_path)
+    sharded = is_shard_index(existing_path)
+    fmt = fmt or (data["format"] if sharded else detect_format(existing_path))
+
+    stale_files = set(changed) | set(deleted)
+    by_target: Dict[str, List[Any]] = {}
+    affected = set()
+
+    for target, doclets in data["doclets"].items():
+        kept = [d for d in doclets if d["source"]["file"] not in stale_files]
+        if len(kept) != len(doclets):
+            affected.add(target)
+        if kept:
+            by_target[target] = kept
+
+    # Keep the incremental manifest in step when there is one
+    fingerprint = extractor_fingerprint()
+    manifest = load_manifest(fingerprint)
+
+    for file_path in changed:
+        if not os.path.exists(file_path):
+            continue  # Deleted in the working tree but not yet in git
+        entry, _ = scan_file_entry(file_path, None)
+        manifest[file_path] = entry
+        if entry["doclets"]:
+            print(f"   Found {len(entry['doclets'])} tag(s) in {file_path}")
+        for doclet in entry["doclets"]:
+            by_target.setdefault(doclet.target, []).append(doclet)
+            affected.add(doclet.target)
+
+    for file_path in deleted:
+        manifest.pop(file_path, None)
+
+    if manifest:
+        save_manifest(manifest, fingerprint)
+
+    for target in affected & set(by_target):
+        by_target[target].sort(key=doclet_order_key)
+
+    output = {
+        "generated": "AUTO-GENERATED by scripts/extract_doclets.py",
+        "total_tags": sum(len(doclets) for doclets in by_target.values()),
+        "targets": len(by_target),
+        "doclets": {target: by_target[target] for target in sorted(by_target)}
+    }
+
+    output_path, shard_stats = write_output(output, fmt, sharded)
+
+    print()
+    print(f"✅ Patched {len(affected)} target(s) from {len(stale_files)} file(s)")
+    print(f"   Total tags: {output['total_tags']}")
+    print(f"   Unique targets: {output['targets']}")
+    if shard_stats:
+        print(f"   Shards: {shard_stats['written']} written, {shard_stats['unchanged']} unchanged, {shard_stats['removed']} removed")
+    print(f"   Output: {output_path}\n")
+
+    return 0
+
+class GitBlobReader:
+    """
+    Streams file contents out of git through one long-lived
+    `git cat-file --batch` process instead of a checkout.
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def read(self, rev: str, path: str) -> Optional[bytes]:
+        """Contents of path at rev, or None if it is not a blob there"""
+        self.process.stdin.write(f"{rev}:{path}\n".encode('utf-8'))
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            return None  # "<object> missing"
+
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # Trailing newline after each object
+
+        return data if header[1] == b"blob" else None
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def git_revision_files(commit: str) -> List[str]:
+    """TypeScript files under SCAN_DIRS at a commit, in full-run order"""
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", "--name-only", commit, "--", *SCAN_DIRS],
+        capture_output=True, text=True, check=True
+    )
+
+    files = [path for path in result.stdout.split("\0") if path.endswith(tuple(EXTENSIONS))]
+    return sorted(files, key=lambda path: doclet_order_key({"source": {"file": path, "line": 0}}))
+
+def extract_revision(rev: str, fmt: Optional[str], output_path: Optional[str]) -> int:
+    """
+    Extract doclets from a git revision without touching the working tree:
+    files are listed with `git ls-tree` and read through one
+    `git cat-file --batch` process into the normal lexer and parser.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        files = git_revision_files(commit)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Cannot read revision {rev}: {(e.stderr or '').strip() or 'unknown revision'}")
+        return 1
+    except OSError as e:
+        print(f"❌ Cannot run git: {e}")
+        return 1
+
+    if output_path:
+        fmt = fmt or detect_format(output_path)
+    else:
+        fmt = fmt or "yaml"
+        safe_rev = re.sub(r"[^A-Za-z0-9._-]+", "_", rev)
+        output_path = f"docs/dev/doclets@{safe_rev}{FORMATS[fmt]}"
+
+    print(f"🔍 Scanning {rev} ({commit[:12]}) for @doc tags...\n")
+
+    by_target: Dict[str, List[Doclet]] = {}
+    total_tags = 0
+    skipped = 0
+
+    with GitBlobReader() as reader:
+        for file_path in files:
+            data = reader.read(commit, file_path)
+            if data is None or DOC_TAG_BYTES not in data:
+                skipped += 1
+                continue
+
+            try:
+                text = decode_source(data)
+            except UnicodeDecodeError as e:
+                print(f"⚠️  Error reading {file_path}@{rev}: {e}")
+                continue
+
+            doclets = scan_text(text, file_path)
+            for doclet in doclets:
+                by_target.setdefault(doclet.target, []).append(doclet)
             if doclets:
-                all_doclets.extend(doclets)
+                total_tags += len(doclets)
                 print(f"   Found {len(doclets)} tag(s) in {file_path}")
 
-    return all_doclets
+    output = {
+        "generated": "AUTO-GENERATED by scripts/extract_doclets.py",
+        "total_tags": total_tags,
+        "targets": len(by_target),
+        "doclets": {target: by_target[target] for target in sorted(by_target)}
+    }
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    write_doclets(output_path, output, fmt)
+
+    print()
+    print(f"✅ Extraction complete for {rev}!")
+    print(f"   Total tags: {total_tags}")
+    print(f"   Unique targets: {len(by_target)}")
+    print(f"   Files: {len(files)} ({skipped} skipped by prefilter)")
+    print(f"   Output: {output_path}\n")
 
-def main():
+    return 0
+
+def format_peak_memory(workers: bool = False) -> str:
+    """
+    Peak resident set size of this process and, when a worker pool ran, of
+    its largest worker (RUSAGE_CHILDREN also covers other subprocesses such
+    as git, so it is only reported for pool runs)
+    """
+    if resource is None:
+        return "n/a"
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    text = f"{own / 2**20:.1f} MiB"
+    if workers:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+        text += f" (largest worker {children / 2**20:.1f} MiB)"
+    return text
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Extract @doc tags from TypeScript sources into docs/dev/doclets.yaml"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the incremental manifest and re-parse every file"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="parse changed files on N worker processes (0 = one per CPU; default: 1)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        help="output format: yaml (default), json or jsonl; build_docs.py detects it"
+    )
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help=f"write one file per target under {SHARD_DIR}/ plus {SHARD_INDEX} instead of a single file"
+    )
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="re-extract only files changed in the working tree since REV (e.g. origin/main) "
+             "and patch the existing output in place; untracked files are not considered"
+    )
+    parser.add_argument(
+        "--rev",
+        metavar="COMMIT",
+        help="extract from a git revision (tag, branch or sha) without checking it out"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        metavar="PATH",
+        help="output file for --rev (default: docs/dev/doclets@<rev>.<format>)"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.rev and (args.since or args.shard):
+        parser.error("--rev cannot be combined with --since or --shard")
+    if args.output and not args.rev:
+        parser.error("--output is only supported with --rev")
+    return args
+
+def main(argv: Optional[List[str]] = None):
     """Main extraction pipeline"""
-    print("🔍 Scanning codebase for @doc tags...\n")
+    args = parse_args(sys.argv[1:] if argv is None else argv)
 
-    all_doclets = []
+    if args.since:
+        return extract_since(args.since, args.format)
+    if args.rev:
+        return extract_revision(args.rev, args.format, args.output)
 
-    # Scan each directory
-    for scan_dir in SCAN_DIRS:
-        print(f"📁 Scanning {scan_dir}/")
-        doclets = scan_directory(scan_dir)
-        all_doclets.extend(doclets)
-        print(f"   Total: {len(doclets)} tag(s)\n")
+    print("🔍 Scanning codebase for @doc tags...\n")
+
+    fingerprint = extractor_fingerprint()
+    previous = {} if args.no_cache else load_manifest(fingerprint)
+    manifest: Dict[str, Dict[str, Any]] = {}
+    file_counts: Counter = Counter()
+    worker_stats: Dict[int, List[float]] = {}
 
-    # Group by target
+    # Doclets grouped by target as files are merged (manifest shares the objects)
     by_target: Dict[str, List[Doclet]] = {}
-    for doclet in all_doclets:
-        target_key = doclet.target
-        if target_key not in by_target:
-            by_target[target_key] = []
-        by_target[target_key].append(doclet)
+    total_tags = 0
+
+    jobs = args.jobs or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
 
-    # Build output structure
+    try:
+        # Scan each directory
+        for scan_dir in SCAN_DIRS:
+            print(f"📁 Scanning {scan_dir}/")
+            tag_count, counts = scan_directory(scan_dir, previous, manifest, by_target, executor, worker_stats)
+            total_tags += tag_count
+            file_counts.update(counts)
+            print(f"   Total: {tag_count} tag(s)\n")
+    finally:
+        if executor:
+            executor.shutdown()
+
+    removed_count = len(set(previous) - set(manifest))
+    save_manifest(manifest, fingerprint)
+
+    # Build output structure (doclets are converted to dicts while writing)
     output = {
         "generated": "AUTO-GENERATED by scripts/extract_doclets.py",
-        "total_tags": len(all_doclets),
+        "total_tags": total_tags,
         "targets": len(by_target),
-        "doclets": {}
+        "doclets": {target: by_target[target] for target in sorted(by_target)}
     }
 
-    # Convert to dict format
-    for target, doclets in sorted(by_target.items()):
-        output["doclets"][target] = [d.to_dict() for d in doclets]
-
-    # Ensure output directory exists
-    os.makedirs("docs/dev", exist_ok=True)
-
-    # Write YAML output
-    output_path = "docs/dev/doclets.yaml"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        yaml.dump(output, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    output_path, shard_stats = write_output(output, args.format or "yaml", args.shard)
 
     print(f"✅ Extraction complete!")
-    print(f"   Total tags: {len(all_doclets)}")
+    print(f"   Total tags: {total_tags}")
     print(f"   Unique targets: {len(by_target)}")
-    print(f"   Output: {output_path}\n")
+    print(f"   Files parsed: {file_counts['parsed']} (reused {file_counts['unchanged'] + file_counts['cached']} from cache, dropped {removed_count})")
+    print(f"   Prefilter skipped: {file_counts['skipped']} of {file_counts['parsed'] + file_counts['skipped']} file(s) read (no {DOC_TAG_BYTES.decode()} tag)")
+    if shard_stats:
+        print(f"   Shards: {shard_stats['written']} written, {shard_stats['unchanged']} unchanged, {shard_stats['removed']} removed")
+    print(f"   Output: {output_path}")
+    print(f"   Peak memory: {format_peak_memory(workers=bool(worker_stats))}\n")
+
+    if worker_stats:
+        print(f"⚙️  Workers: {len(worker_stats)} (--jobs {jobs})")
+        for index, (files, seconds) in enumerate(sorted(worker_stats.values(), reverse=True), 1):
+            rate = files / seconds if seconds else float(files)
+            print(f"   - worker {index}: {files} file(s) in {seconds:.2f}s ({rate:.0f} files/sec)")
+        print()
 
     # Show targets summary
     if by_target:
@@ -245,5 +767,7 @@ def main():
             count = len(by_target[target])
             print(f"   - {target}: {count} tag(s)")
 
+    return 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
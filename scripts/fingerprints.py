@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Content Fingerprints
+
+sha256 helpers shared by the docs pipeline scripts:
+
+- sha256_file(): hash of a file's bytes, e.g. to tell whether a source file
+  changed since a plan or journal recorded it
+- source_fingerprint(): hash of the modules a cache was produced by. Caches
+  (the extraction manifest, the symbol index, the tagging plan) store it and
+  are discarded when it changes, so a change to the code that built them can
+  never leave results behind that a fresh run would not produce.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Optional, Union
+
+PathLike = Union[str, Path]
+
+def sha256_file(file_path: PathLike) -> Optional[str]:
+    """Hex sha256 of a file's bytes, or None when it cannot be read"""
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def source_fingerprint(*module_files: PathLike) -> str:
+    """Hash of the source of the given modules (pass their __file__)"""
+    digest = hashlib.sha256()
+    for module_file in module_files:
+        with open(module_file, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
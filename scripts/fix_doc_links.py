@@ -17,6 +17,8 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+from doc_walk import walk_files
+
 class LinkFixer:
     """Fixes broken internal documentation links"""
 
@@ -27,16 +29,23 @@ class LinkFixer:
         self.anchor_map: Dict[str, Set[str]] = {}  # file path -> set of anchors
         self.fixes_made = 0
         self.errors_found = 0
+        self.md_files: List[Path] = []
+
+    def collect_markdown_files(self):
+        """
+        Walk docs/ once. Ignored, archived (hidden) and node_modules
+        directories are pruned by the walker rather than filtered afterwards.
+        """
+        self.md_files = [
+            md_file for md_file in walk_files(str(self.docs_root))
+            if md_file.suffix == ".md"
+        ]
 
     def build_file_map(self):
         """Build mapping of file names to paths"""
         print("📁 Building file index...\n")
 
-        for md_file in self.docs_root.rglob("*.md"):
-            # Skip archived and generated files
-            if ".archive" in md_file.parts or "node_modules" in md_file.parts:
-                continue
-
+        for md_file in self.md_files:
             rel_path = str(md_file.relative_to(self.docs_root))
             basename = md_file.stem.lower()
 
@@ -50,10 +59,7 @@ class LinkFixer:
         """Build mapping of files to their heading anchors"""
         print("🔗 Building anchor index...\n")
 
-        for md_file in self.docs_root.rglob("*.md"):
-            if ".archive" in md_file.parts or "node_modules" in md_file.parts:
-                continue
-
+        for md_file in self.md_files:
             rel_path = str(md_file.relative_to(self.docs_root))
             anchors = self.extract_anchors(md_file)
             self.anchor_map[rel_path] = anchors
@@ -175,16 +181,14 @@ class LinkFixer:
             print("🚨 DRY RUN MODE - No files will be modified\n")
 
         # Build indices
+        self.collect_markdown_files()
         self.build_file_map()
         self.build_anchor_map()
 
         # Process all markdown files
         print("🔍 Scanning for broken links...\n")
 
-        for md_file in self.docs_root.rglob("*.md"):
-            if ".archive" in md_file.parts or "node_modules" in md_file.parts:
-                continue
-
+        for md_file in self.md_files:
             self.process_file(md_file)
 
         # Print summary
@@ -3,61 +3,281 @@
 Generate Tagging Plan
 
 Reads taggable_items_report.json and generates a detailed tagging plan
-with exact line numbers and tag content for each item.
-
-Usage: python3 scripts/generate_tagging_plan.py [--priority high|medium|low]
-Output: docs/dev/tagging_plan.json
+with exact line numbers and tag content for each item. Items are grouped
+by file and each file is loaded once: declarations in TypeScript files come
+from the symbol index (ts_symbol_index.py), other files (.env.example) are
+read once and matched against one combined pattern for all their items.
+
+Usage: python3 scripts/generate_tagging_plan.py [--priority high|medium|low] [--new-only] [--no-cache]
+                                                [--format json|jsonl]
+Output: docs/dev/tagging_plan.json (.jsonl with --format jsonl; see tagging_store.py)
+
+Each entry carries the owners of its file from CODEOWNERS (see
+codeowners.py) and, when the repo has a CODEOWNERS file, the plan is also
+split per owner into docs/dev/tagging_plan_owners/<owner>.json(l). Each
+shard is a complete plan that apply_tags.py --plan can apply on its own.
+
+The report is read in whichever format the audit wrote it. A jsonl report is
+consumed one file's items at a time and, written as jsonl, the plan entries
+for each file go to disk before the next file is read. The plan format
+defaults to the report's.
+
+With --new-only only the items added (or moved) since the previous audit are
+planned, read from docs/dev/taggable_items_delta.json. That plan goes to
+docs/dev/tagging_plan.new.json(l) (shards in tagging_plan_owners.new/), so
+the full plan is left as it was.
+
+The plan records the sha256 of every source file it covers. The next run
+reuses the previous entry of any item whose file hash is unchanged and only
+locates items whose file changed or that were not planned before
+(--no-cache recomputes every entry). Any change to this script invalidates
+the previous plan.
 """
 
 import os
 import re
 import json
 import sys
+import argparse
+from itertools import groupby
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
+
+from audit_taggable_items import DELTA_FILE
+from codeowners import CodeOwners
+from fingerprints import sha256_file, source_fingerprint
+from tagging_store import FORMATS, PLAN_BASE, REPORT_BASE, RecordReader, RecordWriter, find_file, output_path
+from ts_symbol_index import ITEM_SYMBOLS, Symbol, SymbolIndex
+
+OWNER_SHARD_DIR = "docs/dev/tagging_plan_owners"
+SUMMARY_FILE = "docs/dev/TAGGING_PLAN.md"
+
+# --new-only outputs, next to the full plan's
+NEW_SUFFIX = ".new"
+
+# Shard name for entries whose file has no owner
+UNOWNED = "unowned"
+
+# Plan entries listed in the markdown summary
+READY_SAMPLE = 50
+NOT_FOUND_SAMPLE = 20
+
+def generator_fingerprint() -> str:
+    """Fingerprint of the plan: this script (see fingerprints.py)"""
+    return source_fingerprint(__file__)
+
+def owner_shard_name(owner: str) -> str:
+    """File name stem of an owner's plan shard (@org/team -> org_team)"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", owner.lstrip("@"))
+
+def entry_key(item: Dict) -> str:
+    """Identity of an item across plans"""
+    return f"{item['file']}:{item['type']}:{item['suggested_tag']}"
 
 class TaggingPlanGenerator:
     """Generates detailed tagging plan from audit report"""
 
-    def __init__(self, priority_filter: Optional[str] = None):
+    def __init__(self, priority_filter: Optional[str] = None, new_only: bool = False,
+                 use_cache: bool = True, fmt: Optional[str] = None):
         self.priority_filter = priority_filter
+        self.new_only = new_only
+        self.use_cache = use_cache
+        # Plan format; None = same as the report
+        self.fmt = fmt
+        # A --new-only plan never replaces the full plan
+        suffix = NEW_SUFFIX if new_only else ""
+        self.plan_base = PLAN_BASE + suffix
+        self.shard_dir = OWNER_SHARD_DIR + suffix
+        stem, ext = os.path.splitext(SUMMARY_FILE)
+        self.summary_file = stem + suffix + ext
         self.report: Dict = {}
-        self.plan_items: List[Dict] = []
+        self.report_items: Iterable[Dict] = []
+        self.reader: Optional[RecordReader] = None
+        self.index: Optional[SymbolIndex] = None
+        # Counts and the entries listed in the markdown summary (the plan
+        # itself is not kept in memory)
+        self.status_counts = {"ready": 0, "not_found": 0}
+        self.ready_sample: List[Dict] = []
+        self.not_found_sample: List[Dict] = []
+        self.located_files = 0
+        self.codeowners: Optional[CodeOwners] = None
+        # Per-owner shard writers and counts
+        self.shards: Dict[str, RecordWriter] = {}
+        self.owner_counts: Dict[str, Dict[str, int]] = {}
+        self.footer: Dict = {}
+        self.fingerprint = generator_fingerprint()
+        # Source file -> sha256, for this plan and the one it replaces
+        self.file_hashes: Dict[str, str] = {}
+        self.previous_hashes: Dict[str, str] = {}
+        self.previous_entries: Dict[str, Dict] = {}
+        self.previous_seen = 0
+        self.reuse_stats = {"reused": 0, "recomputed": 0, "dropped": 0}
 
     def load_report(self) -> bool:
-        """Load taggable items report"""
-        report_file = "docs/dev/taggable_items_report.json"
-
-        if not os.path.exists(report_file):
-            print(f"❌ Report not found: {report_file}")
+        """
+        Open the taggable items report (items are read as the plan is
+        generated) or, with --new-only, load the audit delta
+        """
+        report_file = DELTA_FILE if self.new_only else find_file(REPORT_BASE)
+
+        if not report_file or not os.path.exists(report_file):
+            print(f"❌ Report not found: {report_file or output_path(REPORT_BASE, 'json')}")
             print("   Run: pnpm docs:audit-tags")
             return False
 
         try:
-            with open(report_file, 'r', encoding='utf-8') as f:
-                self.report = json.load(f)
-            return True
+            if self.new_only:
+                with open(report_file, 'r', encoding='utf-8') as f:
+                    self.report = json.load(f)
+            else:
+                self.reader = RecordReader(report_file)
+                self.report = self.reader.header
         except Exception as e:
             print(f"❌ Error loading report: {e}")
             return False
 
-    def find_line_number(self, file_path: str, search_pattern: str) -> Optional[int]:
-        """Find line number where tag should be inserted"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+        if self.new_only:
+            # Moved items need a fresh plan entry at their new location too
+            self.report_items = self.report["added"] + [move["item"] for move in self.report["moved"]]
+            self.report["total_items"] = len(self.report_items)
+        else:
+            self.report_items = self.reader.items()
 
-            for i, line in enumerate(lines):
-                if re.search(search_pattern, line):
-                    # Return line number (1-indexed)
-                    # Tag should be inserted BEFORE this line
-                    return i + 1
+        return True
 
+    def load_previous_plan(self):
+        """Entries and file hashes of the plan being replaced, when it was written by this script"""
+        plan_file = find_file(PLAN_BASE)
+        if not self.use_cache or plan_file is None:
+            return
+
+        try:
+            with RecordReader(plan_file) as reader:
+                if reader.header.get("generator") != self.fingerprint:
+                    return
+                self.previous_entries = {entry_key(entry["item"]): entry for entry in reader.items()}
+                self.previous_hashes = reader.footer.get("files", {})
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable previous plan {plan_file}: {e}")
+            self.previous_entries = {}
+
+    def reusable_entry(self, item: Dict) -> Optional[Dict]:
+        """Previous plan entry for an item whose file is unchanged"""
+        entry = self.previous_entries.get(entry_key(item))
+        if entry is None:
             return None
+        self.previous_seen += 1
 
+        file_path = item["file"]
+        digest = self.file_hashes.get(file_path)
+        if digest is None or self.previous_hashes.get(file_path) != digest or entry["item"] != item:
+            return None
+        return entry
+
+    def plan_file(self, file_path: str, items: List[Dict]) -> List[Optional[Dict]]:
+        """Plan entries for one file's items: reused while the file is unchanged, else located"""
+        digest = sha256_file(file_path)
+        if digest:
+            self.file_hashes[file_path] = digest
+
+        entries: List[Optional[Dict]] = [None] * len(items)
+        stale = []
+        for position, item in enumerate(items):
+            entries[position] = self.reusable_entry(item)
+            if entries[position]:
+                self.reuse_stats["reused"] += 1
+            else:
+                stale.append(position)
+
+        if stale:
+            # Locate the rest of the file's items in one load of that file
+            self.located_files += 1
+            located = self.locate_items(file_path, [items[p] for p in stale])
+            for position, line_number in zip(stale, located):
+                entries[position] = self.generate_plan_for_item(items[position], line_number)
+                self.reuse_stats["recomputed"] += 1
+
+        # Ownership is resolved afresh (CODEOWNERS may change without the file)
+        owners = self.codeowners.owners(file_path)
+        for entry in entries:
+            if entry:
+                entry["owners"] = owners
+                entry["owner"] = owners[0] if owners else None
+
+        return entries
+
+    def shard_for(self, owner: str, header: Dict, fmt: str) -> RecordWriter:
+        """The owner's plan shard, opened on its first entry"""
+        if owner not in self.shards:
+            path = os.path.join(self.shard_dir, owner_shard_name(owner) + FORMATS[fmt])
+            self.shards[owner] = RecordWriter(path, {**header, "owner": owner})
+            self.owner_counts[owner] = {"ready": 0, "not_found": 0}
+        return self.shards[owner]
+
+    def add_entry(self, writer: RecordWriter, entry: Optional[Dict]):
+        """Write one plan entry (and its owner shard entry) and count it"""
+        if not entry:
+            return
+
+        writer.write(entry)
+        status = entry["status"]
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+        if self.codeowners.path:
+            owner = entry["owner"] or UNOWNED
+            self.shard_for(owner, writer.header, writer.fmt).write(entry)
+            counts = self.owner_counts[owner]
+            counts[status] = counts.get(status, 0) + 1
+
+        if status == "ready" and len(self.ready_sample) < READY_SAMPLE:
+            self.ready_sample.append(entry)
+        elif status == "not_found" and len(self.not_found_sample) < NOT_FOUND_SAMPLE:
+            self.not_found_sample.append(entry)
+
+    def locate_items(self, file_path: str, items: List[Dict]) -> List[Optional[int]]:
+        """Line to insert each item's tag before (None when not found), one file load for all"""
+        try:
+            if all(item["type"] in ITEM_SYMBOLS for item in items):
+                return self.locate_symbols(file_path, items)
+            return self.locate_lines(file_path, items)
         except Exception as e:
             print(f"⚠️  Error reading {file_path}: {e}")
-            return None
+            return [None] * len(items)
+
+    def locate_symbols(self, file_path: str, items: List[Dict]) -> List[Optional[int]]:
+        """TypeScript declarations, from the symbol index (refreshed if the file changed)"""
+        by_name: Dict[str, List[Symbol]] = {}
+        for symbol in self.index.file(file_path).symbols:
+            by_name.setdefault(symbol.name, []).append(symbol)
+
+        lines: List[Optional[int]] = []
+        for item in items:
+            where = ITEM_SYMBOLS[item["type"]]
+            symbol = next((s for s in by_name.get(item["name"], ()) if where(s)), None)
+            lines.append(symbol.line if symbol else None)
+
+        return lines
+
+    def locate_lines(self, file_path: str, items: List[Dict]) -> List[Optional[int]]:
+        """`NAME=` assignments (env vars; the tag goes in .env.example as a comment)"""
+        names = {item["name"] for item in items if item["type"] == "environment_variable"}
+        found: Dict[str, int] = {}
+
+        if names:
+            pattern = re.compile(
+                "^(" + "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True)) + ")="
+            )
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    match = pattern.match(line)
+                    if match:
+                        # Tag should be inserted BEFORE the first assignment
+                        found.setdefault(match.group(1), line_number)
+
+        return [
+            found.get(item["name"]) if item["type"] == "environment_variable" else None
+            for item in items
+        ]
 
     def generate_tag_content(self, item: Dict) -> str:
         """Generate the JSDoc comment with @doc tag"""
@@ -131,32 +351,19 @@ class TaggingPlanGenerator:
 
         return "\n".join(lines)
 
-    def generate_plan_for_item(self, item: Dict) -> Optional[Dict]:
-        """Generate tagging plan for a single item"""
+    def generate_plan_for_item(self, item: Dict, line_number: Optional[int]) -> Optional[Dict]:
+        """Generate tagging plan for a single item located at line_number"""
         file_path = item["file"]
         name = item["name"]
-        item_type = item["type"]
 
-        # Determine search pattern based on type
-        if item_type == "trpc_procedure":
-            search_pattern = rf'export const {re.escape(name)}\s*='
-        elif item_type == "database_table":
-            search_pattern = rf'export const {re.escape(name)}\s*=\s*pgTable\('
-        elif item_type == "react_component":
-            search_pattern = rf'export (?:function|const) {re.escape(name)}'
-        elif item_type == "environment_variable":
-            # For env vars, tag goes in .env.example as a comment
-            search_pattern = rf'^{re.escape(name)}='
-        else:
+        if item["type"] not in ITEM_SYMBOLS and item["type"] != "environment_variable":
             return None
 
-        # Find line number
-        line_number = self.find_line_number(file_path, search_pattern)
-
         if line_number is None:
             return {
                 "item": item,
                 "status": "not_found",
+                "file": file_path,
                 "error": f"Could not find '{name}' in {file_path}"
             }
 
@@ -177,62 +384,132 @@ class TaggingPlanGenerator:
         """Generate complete tagging plan"""
         print("📝 Generating tagging plan...\n")
 
-        items = self.report.get("items", [])
+        items = self.report_items
 
         # Filter by priority if specified
         if self.priority_filter:
-            items = [i for i in items if i["priority"] == self.priority_filter]
+            items = (i for i in items if i["priority"] == self.priority_filter)
             print(f"   Filtering by priority: {self.priority_filter}")
 
-        print(f"   Processing {len(items)} items\n")
+        # Read before the plan file is replaced
+        self.load_previous_plan()
 
-        # Generate plan for each item
-        ready_count = 0
-        not_found_count = 0
+        self.codeowners = CodeOwners.load()
+        if self.codeowners.path:
+            print(f"   Owners from {self.codeowners.path} ({len(self.codeowners.rules)} rules)")
+            os.makedirs(self.shard_dir, exist_ok=True)
 
-        for item in items:
-            plan_item = self.generate_plan_for_item(item)
+        fmt = self.fmt or (self.reader.fmt if self.reader else "json")
+        plan_path = output_path(self.plan_base, fmt)
+        os.makedirs("docs/dev", exist_ok=True)
 
-            if plan_item:
-                self.plan_items.append(plan_item)
+        header = {
+            "generated": "AUTO-GENERATED by scripts/generate_tagging_plan.py",
+            "priority_filter": self.priority_filter,
+            "scope": "new" if self.new_only else "all",
+            "generator": self.fingerprint,
+        }
+
+        writer = RecordWriter(plan_path, header)
+        try:
+            self.write_plan(writer, items)
+        finally:
+            writer.close()
+            for shard in self.shards.values():
+                shard.close()
+
+        print(f"✅ Plan generated: {plan_path}")
+        if self.shards:
+            print(f"✅ Owner shards generated: {self.shard_dir}/ ({len(self.shards)} owners)")
+        if self.new_only:
+            print(f"   Apply it with: python3 scripts/apply_tags.py --apply --plan {plan_path}")
+        print()
 
-                if plan_item["status"] == "ready":
-                    ready_count += 1
-                elif plan_item["status"] == "not_found":
-                    not_found_count += 1
+        plan = {**self.footer, **header, "path": plan_path}
+
+        # Generate markdown summary
+        self.generate_markdown_summary(plan)
+
+        return plan
+
+    def write_plan(self, writer: RecordWriter, items: Iterable[Dict]):
+        """Plan every item into writer (and the owner shards)"""
+        if self.reader and self.reader.streaming:
+            # Items arrive grouped by file: plan and write one file at a time
+            print("   Streaming items one file at a time\n")
+            for file_path, file_items in groupby(items, key=lambda item: item["file"]):
+                for entry in self.plan_file(file_path, list(file_items)):
+                    self.add_entry(writer, entry)
+        else:
+            items = list(items)
+            print(f"   Processing {len(items)} items\n")
+
+            by_file: Dict[str, List[int]] = {}
+            for position, item in enumerate(items):
+                by_file.setdefault(item["file"], []).append(position)
+
+            if writer.fmt == "jsonl":
+                # jsonl plans (and shards) are grouped by file, as apply_tags reads them
+                for file_path, positions in by_file.items():
+                    for entry in self.plan_file(file_path, [items[p] for p in positions]):
+                        self.add_entry(writer, entry)
+            else:
+                entries: List[Optional[Dict]] = [None] * len(items)
+                for file_path, positions in by_file.items():
+                    planned = self.plan_file(file_path, [items[p] for p in positions])
+                    for position, entry in zip(positions, planned):
+                        entries[position] = entry
+
+                # Plan entries stay in report order
+                for entry in entries:
+                    self.add_entry(writer, entry)
+
+        self.reuse_stats["dropped"] = len(self.previous_entries) - self.previous_seen
+
+        print(f"   Reused {self.reuse_stats['reused']} entries from the previous plan, "
+              f"recomputed {self.reuse_stats['recomputed']} in {self.located_files} changed files "
+              f"({self.reuse_stats['dropped']} dropped)\n")
+
+        ready_count = self.status_counts["ready"]
+        not_found_count = self.status_counts["not_found"]
 
         # Print summary
         print("=" * 60)
         print("📊 Plan Generation Summary")
         print("=" * 60)
-        print(f"Total items: {len(self.plan_items)}")
+        print(f"Total items: {writer.count}")
         print(f"Ready to tag: {ready_count}")
         print(f"Not found: {not_found_count}")
+        print(f"Reused: {self.reuse_stats['reused']}")
+        print(f"Recomputed: {self.reuse_stats['recomputed']}")
         print()
 
-        # Write plan
-        plan = {
-            "generated": "AUTO-GENERATED by scripts/generate_tagging_plan.py",
-            "priority_filter": self.priority_filter,
-            "total_items": len(self.plan_items),
+        owners = {}
+        for owner, shard in sorted(self.shards.items()):
+            counts = self.owner_counts[owner]
+            shard.finish({"total_items": shard.count, **counts})
+            owners[owner] = {"shard": shard.path, "total_items": shard.count, **counts}
+        self.remove_stale_shards()
+
+        self.footer = {
+            "total_items": writer.count,
             "ready": ready_count,
             "not_found": not_found_count,
-            "items": self.plan_items
+            **self.reuse_stats,
+            "owners": owners,
+            "files": self.file_hashes,
         }
+        writer.finish(self.footer)
 
-        output_path = "docs/dev/tagging_plan.json"
-        os.makedirs("docs/dev", exist_ok=True)
+    def remove_stale_shards(self):
+        """Delete shards of owners that no longer have entries"""
+        if not os.path.isdir(self.shard_dir):
+            return
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(plan, f, indent=2)
-
-        print(f"✅ Plan generated: {output_path}")
-        print()
-
-        # Generate markdown summary
-        self.generate_markdown_summary(plan)
-
-        return plan
+        live = {os.path.basename(shard.path) for shard in self.shards.values()}
+        for name in os.listdir(self.shard_dir):
+            if name not in live and name.endswith(tuple(FORMATS.values())):
+                os.remove(os.path.join(self.shard_dir, name))
 
     def generate_markdown_summary(self, plan: Dict):
         """Generate markdown summary of tagging plan"""
@@ -247,12 +524,17 @@ class TaggingPlanGenerator:
             lines.append(f"**Priority Filter**: {plan['priority_filter']}")
             lines.append("")
 
+        if plan["scope"] == "new":
+            lines.append("**Scope**: items added or moved since the previous audit")
+            lines.append("")
+
         lines.extend([
             "## Summary",
             "",
             f"- **Total items**: {plan['total_items']}",
             f"- **Ready to tag**: {plan['ready']}",
             f"- **Not found**: {plan['not_found']}",
+            f"- **Reused from previous plan**: {plan['reused']} (recomputed: {plan['recomputed']})",
             "",
             "## Items by Status",
             "",
@@ -260,14 +542,11 @@ class TaggingPlanGenerator:
             "",
         ])
 
-        ready_items = [i for i in plan["items"] if i["status"] == "ready"]
-        not_found_items = [i for i in plan["items"] if i["status"] == "not_found"]
-
-        if ready_items:
+        if self.ready_sample:
             lines.append("| File | Name | Type | Line |")
             lines.append("|------|------|------|------|")
 
-            for item in ready_items[:50]:  # Limit to first 50
+            for item in self.ready_sample:  # Limited to the first READY_SAMPLE
                 file_path = item["file"]
                 name = item["item"]["name"]
                 item_type = item["item"]["type"]
@@ -275,9 +554,9 @@ class TaggingPlanGenerator:
 
                 lines.append(f"| {file_path} | {name} | {item_type} | {line} |")
 
-            if len(ready_items) > 50:
+            if plan["ready"] > len(self.ready_sample):
                 lines.append("")
-                lines.append(f"...and {len(ready_items) - 50} more")
+                lines.append(f"...and {plan['ready'] - len(self.ready_sample)} more")
         else:
             lines.append("No items ready to tag.")
 
@@ -287,22 +566,37 @@ class TaggingPlanGenerator:
             "",
         ])
 
-        if not_found_items:
-            for item in not_found_items[:20]:
+        if self.not_found_sample:
+            for item in self.not_found_sample:
                 name = item["item"]["name"]
                 error = item.get("error", "Unknown error")
                 lines.append(f"- **{name}**: {error}")
 
-            if len(not_found_items) > 20:
-                lines.append(f"- ...and {len(not_found_items) - 20} more")
+            if plan["not_found"] > len(self.not_found_sample):
+                lines.append(f"- ...and {plan['not_found'] - len(self.not_found_sample)} more")
         else:
             lines.append("No items with errors.")
 
+        if plan["owners"]:
+            lines.extend([
+                "",
+                "## By Owner",
+                "",
+                "| Owner | Ready | Not found | Shard |",
+                "|-------|-------|-----------|-------|",
+            ])
+            for owner, shard in plan["owners"].items():
+                lines.append(f"| {owner} | {shard['ready']} | {shard['not_found']} | `{shard['shard']}` |")
+            lines.extend([
+                "",
+                "Apply one owner's share with `python3 scripts/apply_tags.py --plan <shard>`.",
+            ])
+
         lines.extend([
             "",
             "## Next Steps",
             "",
-            "1. Review this plan: `docs/dev/tagging_plan.json`",
+            f"1. Review this plan: `{plan['path']}`",
             "2. Manually verify a few items (check line numbers are correct)",
             "3. Apply tags: `pnpm docs:tag-apply` (DRY RUN first)",
             "4. Review applied tags",
@@ -310,12 +604,12 @@ class TaggingPlanGenerator:
             "",
             "## Manual Application",
             "",
-            "To manually apply tags, copy the `tag_content` from `tagging_plan.json`",
+            f"To manually apply tags, copy the `tag_content` from `{os.path.basename(plan['path'])}`",
             "and insert it at the `insert_before_line` number in each file.",
             "",
         ])
 
-        output_path = "docs/dev/TAGGING_PLAN.md"
+        output_path = self.summary_file
 
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write("\n".join(lines))
@@ -334,26 +628,54 @@ class TaggingPlanGenerator:
         if not self.load_report():
             return 1
 
-        print(f"✅ Loaded report: {self.report['total_items']} items\n")
+        if self.new_only:
+            print(f"✅ Loaded audit delta: {self.report['total_items']} new or moved items\n")
+        else:
+            print(f"✅ Loaded report: {self.report['total_items']} items\n")
 
         # Generate plan
-        self.generate_plan()
+        self.index = SymbolIndex()
+        try:
+            self.generate_plan()
+        finally:
+            self.index.close()
+            if self.reader:
+                self.reader.close()
 
         return 0
 
-def main():
-    priority_filter = None
-
-    # Parse arguments
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--priority" and len(sys.argv) > 2:
-            priority_filter = sys.argv[2]
-            if priority_filter not in ["high", "medium", "low"]:
-                print(f"❌ Invalid priority: {priority_filter}")
-                print("   Valid: high, medium, low")
-                return 1
-
-    generator = TaggingPlanGenerator(priority_filter=priority_filter)
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate docs/dev/tagging_plan.json from the taggable items audit"
+    )
+    parser.add_argument(
+        "--priority",
+        choices=["high", "medium", "low"],
+        help="only plan items of this priority"
+    )
+    parser.add_argument(
+        "--new-only",
+        action="store_true",
+        help=f"only plan items added or moved since the previous audit ({DELTA_FILE})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the previous plan and recompute every entry"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        help="plan format: json or jsonl (streamed, one entry per line); default: the report's format"
+    )
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    generator = TaggingPlanGenerator(
+        priority_filter=args.priority, new_only=args.new_only,
+        use_cache=not args.no_cache, fmt=args.format
+    )
     return generator.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Store Formats
+
+Document lookup and format detection shared by the pipeline's stores
+(doclet_store.py for doclets, tagging_store.py for the tagging report and
+plan). A document is written to <base><ext> for one of the store's formats;
+when several exist the most recently written one is current. Readers detect
+the format from the extension, falling back to sniffing the first line.
+"""
+
+import os
+import json
+from typing import Dict, Iterable, Optional
+
+def output_path(base: str, fmt: str, formats: Dict[str, str]) -> str:
+    """Default path of a document in a format"""
+    return base + formats[fmt]
+
+def latest_file(paths: Iterable[str]) -> Optional[str]:
+    """Most recently written of the paths that exist, or None"""
+    existing = [path for path in paths if os.path.exists(path)]
+    if not existing:
+        return None
+    return max(existing, key=os.path.getmtime)
+
+def detect_format(path: str, formats: Dict[str, str], jsonl_header_key: str, fallback: str) -> str:
+    """
+    Format of a document from its extension or, failing that, its first
+    line: a jsonl header record, the start of a json document, or else
+    `fallback`
+    """
+    for fmt, ext in formats.items():
+        if path.endswith(ext):
+            return fmt
+
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline().strip()
+
+    if not first_line.startswith("{"):
+        return fallback
+
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        return "json"  # Multi-line JSON document
+
+    return "jsonl" if jsonl_header_key in header else "json"
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tagging Store
+
+Reads and writes the documents passed between the tagging stages
+(audit_taggable_items.py -> generate_tagging_plan.py -> apply_tags.py):
+docs/dev/taggable_items_report.* and docs/dev/tagging_plan.*. Two formats
+are supported:
+
+- json:  docs/dev/<name>.json, one pretty-printed document (default)
+- jsonl: docs/dev/<name>.jsonl, a header record, one item per line grouped
+         by file, then a footer record with the totals that are only known
+         once every item has been written
+
+Readers detect the format from the file extension, falling back to sniffing
+the content, and hand out items as they are parsed. With jsonl a stage can
+start on the first file's items straight away and holds one record (or one
+file's records) at a time; a json document has to be loaded whole.
+"""
+
+import json
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import store_formats
+from store_formats import latest_file
+
+REPORT_BASE = "docs/dev/taggable_items_report"
+PLAN_BASE = "docs/dev/tagging_plan"
+
+FORMATS = {
+    "json": ".json",
+    "jsonl": ".jsonl",
+}
+
+JSONL_HEADER_KEY = "tagging_jsonl"
+JSONL_FOOTER_KEY = "tagging_jsonl_end"
+
+def output_path(base: str, fmt: str) -> str:
+    """Default path of a document in a format"""
+    return store_formats.output_path(base, fmt, FORMATS)
+
+def find_file(base: str) -> Optional[str]:
+    """Most recently written document for base in any format, or None"""
+    return latest_file(base + ext for ext in FORMATS.values())
+
+def detect_format(path: str) -> str:
+    """Detect the format of a document from its extension or content"""
+    return store_formats.detect_format(path, FORMATS, JSONL_HEADER_KEY, fallback="json")
+
+class RecordWriter:
+    """
+    Writes one document: header fields up front, items one at a time, and
+    footer fields once the items are done (finish()). jsonl items go
+    straight to disk; json items are buffered until finish().
+    """
+
+    def __init__(self, path: str, header: Dict[str, Any], fmt: Optional[str] = None):
+        self.path = path
+        self.fmt = fmt or ("jsonl" if path.endswith(FORMATS["jsonl"]) else "json")
+        self.header = header
+        self.count = 0
+        self._items: List[Dict[str, Any]] = []
+        self._f = open(path, 'w', encoding='utf-8')
+
+        if self.fmt == "jsonl":
+            self._f.write(json.dumps({JSONL_HEADER_KEY: 1, **header}) + "\n")
+
+    def write(self, item: Dict[str, Any]):
+        self.count += 1
+        if self.fmt == "jsonl":
+            self._f.write(json.dumps(item) + "\n")
+        else:
+            self._items.append(item)
+
+    def finish(self, footer: Dict[str, Any]):
+        """Write the footer (or the whole json document) and close the file"""
+        if self.fmt == "jsonl":
+            self._f.write(json.dumps({JSONL_FOOTER_KEY: 1, **footer}) + "\n")
+        else:
+            json.dump({**self.header, **footer, "items": self._items}, self._f, indent=2)
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class RecordReader:
+    """
+    Reads one document. `header` is available straight away; `footer` once
+    items() has been consumed (json documents have both up front, as the
+    same dict).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fmt = detect_format(path)
+        self.footer: Dict[str, Any] = {}
+        self._f = open(path, 'r', encoding='utf-8')
+
+        try:
+            if self.fmt == "jsonl":
+                self.header = json.loads(self._f.readline())
+                self.header.pop(JSONL_HEADER_KEY, None)
+                self._items: Optional[List[Dict[str, Any]]] = None
+            else:
+                document = json.load(self._f)
+                self._items = document.pop("items", [])
+                self.header = self.footer = document
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def streaming(self) -> bool:
+        """Items come off disk one at a time, grouped by file"""
+        return self.fmt == "jsonl"
+
+    def items(self) -> Iterator[Dict[str, Any]]:
+        if self._items is not None:
+            yield from self._items
+            return
+
+        for line in self._f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if JSONL_FOOTER_KEY in record:
+                record.pop(JSONL_FOOTER_KEY)
+                self.footer = record
+                return
+            yield record
+
+    def items_by_file(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """(file, items) for each run of consecutive items in the same file"""
+        for file_path, items in groupby(self.items(), key=lambda item: item["file"]):
+            yield file_path, list(items)
+
+    def read_all(self) -> Dict[str, Any]:
+        """The whole document as a json document would hold it"""
+        items = list(self.items())
+        return {**self.header, **self.footer, "items": items}
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_document(path: str) -> Dict[str, Any]:
+    """Load a whole document in either format"""
+    with RecordReader(path) as reader:
+        return reader.read_all()
@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the docs pipeline script tests.
+
+The scripts use paths relative to the repo root, so each test runs in a
+scratch repo (the `repo` fixture) built from the files it needs.
+
+Run: python3 -m pytest scripts/tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+class Repo:
+    """Scratch repo rooted at the current directory"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def write(self, path: str, text: str) -> Path:
+        file_path = self.root / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(text, encoding="utf-8")
+        return file_path
+
+    def read(self, path: str) -> str:
+        return (self.root / path).read_text(encoding="utf-8")
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch) -> Repo:
+    monkeypatch.chdir(tmp_path)
+    return Repo(tmp_path)
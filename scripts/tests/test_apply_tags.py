@@ -0,0 +1,55 @@
+"""apply_tags.py: the journal commits a batch whole or reports what did not land"""
+
+import os
+
+import pytest
+
+from apply_tags import TagJournal
+
+BACKUP_DIR = ".tag-backups"
+
+def stage_batch(repo, journal):
+    repo.write("lib/a.ts", "export const a = 1;\n")
+    repo.write("lib/b.ts", "export const b = 2;\n")
+    journal.begin()
+    journal.stage("lib/a.ts", "/** @doc:lib#a */\nexport const a = 1;\n", 1)
+    journal.stage("lib/b.ts", "/** @doc:lib#b */\nexport const b = 2;\n", 1)
+
+def test_interrupted_commit_is_rolled_forward(repo):
+    journal = TagJournal(BACKUP_DIR)
+    stage_batch(repo, journal)
+
+    # Interrupted after "staged" was written and the first file was swapped in
+    journal._append({"op": "staged"})
+    os.replace(journal.entries[0]["staged"], "lib/a.ts")
+
+    assert TagJournal(BACKUP_DIR).recover() == "rolled_forward"
+    assert repo.read("lib/a.ts").startswith("/** @doc:lib#a */")
+    assert repo.read("lib/b.ts").startswith("/** @doc:lib#b */")
+    assert not os.path.exists(journal.dir)
+
+def test_interrupted_staging_is_rolled_back(repo):
+    journal = TagJournal(BACKUP_DIR)
+    stage_batch(repo, journal)
+
+    assert TagJournal(BACKUP_DIR).recover() == "rolled_back"
+    assert repo.read("lib/a.ts") == "export const a = 1;\n"
+    assert repo.read("lib/b.ts") == "export const b = 2;\n"
+
+def test_file_is_staged_once_per_batch(repo):
+    journal = TagJournal(BACKUP_DIR)
+    stage_batch(repo, journal)
+
+    with pytest.raises(ValueError):
+        journal.stage("lib/a.ts", "/** @doc:lib#other */\nexport const a = 1;\n", 1)
+
+    assert [entry["file"] for entry in journal.commit()] == ["lib/a.ts", "lib/b.ts"]
+    assert repo.read("lib/a.ts").startswith("/** @doc:lib#a */")
+
+def test_file_changed_after_staging_is_reported(repo):
+    journal = TagJournal(BACKUP_DIR)
+    stage_batch(repo, journal)
+    repo.write("lib/b.ts", "export const b = 3;\n")
+
+    assert [entry["file"] for entry in journal.commit()] == ["lib/a.ts"]
+    assert repo.read("lib/b.ts") == "export const b = 3;\n"
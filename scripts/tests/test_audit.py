@@ -0,0 +1,83 @@
+"""audit_taggable_items.py: existing tags are the same from extraction output and from a scan"""
+
+import json
+
+import audit_taggable_items
+import extract_doclets
+from extract_doclets import MANIFEST_FILE
+from ts_symbol_index import SymbolIndex
+
+ROUTER = """\
+import { protectedProcedure, router } from "../trpc";
+
+export const clientsRouter = router({
+  /**
+   * @doc:api/clients#list
+   * @doc:api/clients#archive
+   * @doc-summary Lists and archives clients
+   */
+  list: protectedProcedure.query(async () => []),
+  archive: protectedProcedure.mutation(async () => null),
+  // @doc:api/clients#restore (not a JSDoc block)
+  restore: protectedProcedure.mutation(async () => null),
+});
+"""
+
+def audit(*args):
+    assert audit_taggable_items.main(list(args)) == 0
+    with open("docs/dev/taggable_items_report.json", encoding="utf-8") as f:
+        return json.load(f)
+
+def untagged(report):
+    return sorted(item["name"] for item in report["items"] if item["type"] == "trpc_procedure")
+
+def test_multi_tag_block_counts_once_whatever_the_tag_source(repo):
+    repo.write("app/server/routers/clients.ts", ROUTER)
+
+    assert extract_doclets.main([]) == 0
+    from_manifest = audit()
+    assert from_manifest["tag_source"]["source"] == MANIFEST_FILE
+    assert from_manifest["tag_source"]["extracted_files"] == 1
+
+    scanned = audit("--no-cache")
+    assert scanned["tag_source"]["source"] is None
+    assert scanned["tag_source"]["scanned_files"] == 1
+
+    # Only the block's first @doc: is a doclet, so only `list` is tagged
+    assert untagged(from_manifest) == untagged(scanned) == ["archive", "restore"]
+    assert from_manifest["existing_tags"] == scanned["existing_tags"] == 1
+
+def test_files_only_wanted_for_tags_are_not_indexed(repo):
+    repo.write("app/server/routers/clients.ts", ROUTER)
+    # components/ui is skipped by the component scanner: only its tags matter
+    repo.write("components/ui/button.tsx", "/**\n * @doc:components/ui#Button\n */\nexport function Button() {}\n")
+    repo.write("lib/config.ts", 'export const region = process.env.AWS_REGION ?? "eu-west-2";\n')
+    repo.write("lib/format.ts", "export const pad = (s: string) => s.padStart(2, '0');\n")
+
+    report = audit("--no-cache")
+
+    assert report["existing_tags"] == 2
+    # The router (symbols) and lib/config.ts (process.env) are tokenized
+    assert report["cache"]["parsed"] == 2
+    assert report["cache"]["skipped"] == 2
+
+    # Nothing changed: no file is read again
+    report = audit()
+    assert report["cache"]["unchanged"] == 4
+
+    # A file indexed for its tags only is tokenized once its symbols are wanted
+    index = SymbolIndex()
+    try:
+        assert [symbol.name for symbol in index.file("lib/format.ts").symbols] == ["pad"]
+    finally:
+        index.close()
+
+def test_env_reads_include_destructuring_and_root_configs(repo):
+    repo.write(".env.example", "MICROSOFT_CLIENT_ID=\nSENTRY_ORG=\nUNUSED_KEY=\n")
+    repo.write("lib/auth.ts", "const { MICROSOFT_CLIENT_ID, NODE_ENV: env } =\n  process.env;\n")
+    repo.write("next.config.ts", "export default { org: process.env.SENTRY_ORG };\n")
+
+    findings = audit("--no-cache")["findings"]["env_vars"]
+
+    assert findings["referenced"] == 3
+    assert [var["name"] for var in findings["unused"]] == ["UNUSED_KEY"]
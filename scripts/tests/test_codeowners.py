@@ -0,0 +1,45 @@
+"""codeowners.py lookups against a linear last-match-wins scan"""
+
+import pytest
+
+from codeowners import CodeOwners
+
+CODEOWNERS = """\
+* @all
+*.ts @ts
+*.test.ts @testers
+*.d.ts @types
+/lib/ @lib
+/lib/db/*.test.ts @db-testers
+.env.* @ops
+"""
+
+def linear_owners(codeowners, path):
+    for rule in reversed(codeowners.rules):
+        if rule.spec.match_file(path):
+            return list(rule.owners)
+    return []
+
+@pytest.mark.parametrize("path, owners", [
+    ("app/a.test.ts", ["@testers"]),
+    ("app/x.d.ts", ["@types"]),
+    ("app/page.ts", ["@ts"]),
+    ("lib/a.test.ts", ["@lib"]),
+    ("lib/db/a.test.ts", ["@db-testers"]),
+    ("README.md", ["@all"]),
+    (".env.example", ["@ops"]),
+])
+def test_multi_dot_patterns(repo, path, owners):
+    repo.write("CODEOWNERS", CODEOWNERS)
+    codeowners = CodeOwners.load()
+
+    assert codeowners.owners(path) == owners
+    assert codeowners.owners(path) == linear_owners(codeowners, path)
+
+def test_multi_dot_pattern_after_catch_all(repo):
+    repo.write(".github/CODEOWNERS", "* @all\n*.test.ts @testers\n*.d.ts @types\n")
+    codeowners = CodeOwners.load()
+
+    assert codeowners.owners("lib/a.test.ts") == ["@testers"]
+    assert codeowners.owners("lib/x.d.ts") == ["@types"]
+    assert codeowners.owners("lib/x.ts") == ["@all"]
@@ -0,0 +1,17 @@
+"""doc_walk.py: build output is pruned at the repo root only"""
+
+from doc_walk import walk_files
+
+def walked(root="."):
+    return sorted(str(path) for path in walk_files(root))
+
+def test_build_dirs_pruned_only_at_repo_root(repo):
+    repo.write("build/page.tsx", "")
+    repo.write("coverage/lcov.ts", "")
+    repo.write("app/build/page.tsx", "")
+    repo.write("app/(marketing)/out/page.tsx", "")
+    repo.write("app/node_modules/pkg/index.ts", "")
+
+    expected = ["app/(marketing)/out/page.tsx", "app/build/page.tsx"]
+    assert walked() == expected
+    assert walked("app") == expected
@@ -0,0 +1,107 @@
+"""generate_tagging_plan.py -> apply_tags.py through the plan documents"""
+
+import json
+
+import apply_tags
+import generate_tagging_plan
+from tagging_store import RecordReader
+
+ROUTER = """\
+import { protectedProcedure, router } from "../trpc";
+
+export const clientsRouter = router({
+  list: protectedProcedure.query(async () => []),
+});
+"""
+
+def report_item(name, router="clients"):
+    return {
+        "type": "trpc_procedure",
+        "category": "api",
+        "file": f"app/server/routers/{router}.ts",
+        "name": name,
+        "router": router,
+        "suggested_tag": f"api/{router}#{name}",
+        "priority": "high",
+    }
+
+def write_report(repo, names):
+    items = [report_item(name) for name in names]
+    lines = [{"tagging_jsonl": 1, "total_items": len(items)}] + items + [{"tagging_jsonl_end": 1}]
+    repo.write("docs/dev/taggable_items_report.jsonl", "".join(json.dumps(line) + "\n" for line in lines))
+
+def test_jsonl_plan_with_not_found_entry(repo, capsys):
+    repo.write("app/server/routers/clients.ts", ROUTER)
+    # "archive" was renamed after the audit
+    write_report(repo, ["list", "archive"])
+
+    assert generate_tagging_plan.main(["--format", "jsonl"]) == 0
+
+    with RecordReader("docs/dev/tagging_plan.jsonl") as reader:
+        grouped = list(reader.items_by_file())
+    assert [file_path for file_path, _ in grouped] == ["app/server/routers/clients.ts"]
+    assert sorted(entry["status"] for entry in grouped[0][1]) == ["not_found", "ready"]
+
+    applicator = apply_tags.TagApplicator(dry_run=True)
+    assert applicator.load_plan()
+    ready = list(applicator.ready_items_by_file())
+    applicator.reader.close()
+    assert [(file_path, [e["item"]["name"] for e in entries]) for file_path, entries in ready] == [
+        ("app/server/routers/clients.ts", ["list"])
+    ]
+
+    assert apply_tags.main(["--apply"]) == 0
+    assert "@doc:api/clients#list" in repo.read("app/server/routers/clients.ts")
+
+def test_jsonl_plan_from_json_report_is_grouped_by_file(repo):
+    repo.write("app/server/routers/clients.ts", ROUTER.replace("list:", "list: protectedProcedure.query(async () => []),\n  archive:"))
+    repo.write("app/server/routers/invoices.ts", ROUTER.replace("clients", "invoices"))
+    # A json report lists items in scan order, not grouped by file
+    items = [report_item("list"), report_item("list", "invoices"), report_item("archive")]
+    repo.write("docs/dev/taggable_items_report.json", json.dumps({"total_items": len(items), "items": items}))
+
+    assert generate_tagging_plan.main(["--format", "jsonl"]) == 0
+
+    with RecordReader("docs/dev/tagging_plan.jsonl") as reader:
+        grouped = [(file_path, [e["item"]["name"] for e in entries]) for file_path, entries in reader.items_by_file()]
+    assert grouped == [
+        ("app/server/routers/clients.ts", ["list", "archive"]),
+        ("app/server/routers/invoices.ts", ["list"]),
+    ]
+
+    assert apply_tags.main(["--apply"]) == 0
+    clients = repo.read("app/server/routers/clients.ts")
+    assert "@doc:api/clients#list" in clients and "@doc:api/clients#archive" in clients
+    assert "@doc:api/invoices#list" in repo.read("app/server/routers/invoices.ts")
+
+def test_jsonl_plan_not_grouped_by_file_is_rejected(repo, capsys):
+    repo.write("app/server/routers/clients.ts", ROUTER)
+    write_report(repo, ["list"])
+    assert generate_tagging_plan.main(["--format", "jsonl"]) == 0
+
+    # Split the file's entries into two runs
+    lines = repo.read("docs/dev/tagging_plan.jsonl").splitlines(keepends=True)
+    other = json.loads(lines[1])
+    other.update(file="app/server/routers/other.ts", status="not_found")
+    lines[2:2] = [json.dumps(other) + "\n", lines[1]]
+    repo.write("docs/dev/tagging_plan.jsonl", "".join(lines))
+
+    assert apply_tags.main(["--apply"]) == 1
+    assert "not grouped by file" in capsys.readouterr().out
+    assert "@doc:" not in repo.read("app/server/routers/clients.ts")
+
+def test_new_only_plan_leaves_the_full_plan(repo):
+    repo.write("app/server/routers/clients.ts", ROUTER)
+    write_report(repo, ["list"])
+    assert generate_tagging_plan.main([]) == 0
+    full_plan = repo.read("docs/dev/tagging_plan.jsonl")
+
+    repo.write("docs/dev/taggable_items_delta.json", json.dumps(
+        {"added": [report_item("list")], "resolved": [], "moved": []}
+    ))
+    assert generate_tagging_plan.main(["--new-only"]) == 0
+
+    assert repo.read("docs/dev/tagging_plan.jsonl") == full_plan
+    with RecordReader("docs/dev/tagging_plan.new.json") as reader:
+        assert reader.header["scope"] == "new"
+        assert [entry["item"]["name"] for entry in reader.items()] == ["list"]
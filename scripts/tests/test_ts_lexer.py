@@ -0,0 +1,41 @@
+"""ts_lexer.py: the doc comment scanner and the tokenizer agree on literals"""
+
+import pytest
+
+from extract_doclets import scan_text
+from ts_lexer import decode_source, iter_doc_comments, tokenize
+from ts_symbol_index import scan_source
+
+DOC_BLOCK = """
+/**
+ * @doc:api/x#y
+ */
+export const x = 1;
+"""
+
+@pytest.mark.parametrize("prefix", [
+    "export const hasTick = (s: string) => /`/.test(s);\n",
+    "export const first = list?.[0] ?? /'/.exec(s);\n",
+    "export const tick = s.match(/`/g) ? 1 : 2;\n",
+    "const t = `${a / 2}` + `/**`;\n",
+])
+def test_doc_block_after_literals(prefix):
+    text = prefix + DOC_BLOCK
+
+    comments = list(iter_doc_comments(text))
+    assert [comment.strip() for _, comment in comments] == ["@doc:api/x#y"]
+    assert [doclet.target for doclet in scan_text(text, "x.ts")] == ["api/x#y"]
+
+    symbols = {symbol.name: symbol for symbol in scan_source(text)[0]}
+    assert symbols["x"].doc_tag == "api/x#y"
+
+def test_regex_after_arrow_is_one_token():
+    tokens = tokenize("const f = () => /`/g;")
+    assert ("regex", "/`/g") in [(token.kind, token.text) for token in tokens]
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+def test_doc_block_lines_ignore_line_endings(newline):
+    text = decode_source(("// header\n" + DOC_BLOCK).replace("\n", newline).encode("utf-8"))
+
+    assert text == "// header\n" + DOC_BLOCK
+    assert [line for line, _ in iter_doc_comments(text)] == [3]
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+TypeScript Lexer
+
+The JS/TS lexing rules of the docs pipeline, shared by extract_doclets.py and
+ts_symbol_index.py so both agree on what is a comment, a string, a template
+literal (with nested ${...} expressions) or a regex literal. There are two
+entry points over the same rules:
+
+- iter_doc_comments(): one forward pass that jumps from one state-changing
+  character to the next and yields the JSDoc blocks; for callers that only
+  need comments (doclet extraction)
+- tokenize(): every token (identifiers, punctuation, literals, comments) for
+  the symbol parser
+
+decode_source() decodes source bytes with the newline handling of text-mode open().
+
+doc_tag() is the one rule for the @doc tag of a JSDoc block, whichever way
+the block was found.
+
+Whether a "/" opens a regex literal or is a division is decided by what
+precedes it (REGEX_PRECEDERS, REGEX_KEYWORDS) in both.
+"""
+
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+class Token(NamedTuple):
+    kind: str   # comment, ident, string, template, regex, number, punct
+    text: str
+    start: int  # character offset
+
+# One token, with the whitespace before it (identifiers, the most common, first)
+TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<ident>[A-Za-z_$][\w$]*)
+    | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+    | (?P<template>`)
+    | (?P<number>\d[\w.]*|\.\d[\w]*)
+    | (?P<punct>=>|\?\.|\.\.\.|[{}()\[\];,:.=<>!?+\-*/%&|^~@#])
+    | (?P<other>\S)
+    )
+""", re.VERBOSE | re.DOTALL)
+
+TEMPLATE_CHUNK = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*", re.DOTALL)
+REGEX_BODY = re.compile(r"(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])*/[A-Za-z]*")
+
+# Jump targets of iter_doc_comments: each is the next character that can change state
+CODE_TOKEN = re.compile(r"/\*|//|[/'\"`]")
+CODE_TOKEN_IN_TEMPLATE = re.compile(r"/\*|//|[/'\"`{}]")
+TEMPLATE_TOKEN = re.compile(r"\\.|`|\$\{", re.DOTALL)
+STRING_END = {
+    "'": re.compile(r"(?:[^'\\\n]|\\.)*('|\n|$)", re.DOTALL),
+    '"': re.compile(r'(?:[^"\\\n]|\\.)*("|\n|$)', re.DOTALL),
+}
+
+DOC_TAG_PATTERN = re.compile(r"@doc:([^\s]+)")
+
+# A "/" after one of these starts a regex literal rather than a division
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%~^") | {"=>", "?."}
+REGEX_KEYWORDS = {
+    "return", "typeof", "case", "do", "else", "in", "of", "new", "delete",
+    "void", "throw", "instanceof", "yield", "await",
+}
+
+def decode_source(data: bytes) -> str:
+    """UTF-8 source with newlines normalised as open() in text mode would"""
+    return data.decode('utf-8').replace("\r\n", "\n").replace("\r", "\n")
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+def _lex(text: str, pos: int, tokens: List[Token], nested: bool = False) -> int:
+    """
+    Tokenize from pos into tokens. When nested we are inside a template
+    `${...}` and lexing stops after the matching "}".
+
+    Plain tokens come straight off one finditer; it is restarted after each
+    template or regex literal, whose end the pattern cannot know.
+    """
+    depth = 0
+    # Last code (non-comment) token: whether "/" starts a regex depends on it
+    prev_kind: Optional[str] = None
+    prev_text = ""
+    append = tokens.append
+
+    while True:
+        for match in TOKEN.finditer(text, pos):
+            kind = match.lastgroup
+            start = match.start(kind)
+            value = match.group(kind)
+
+            if kind == "template":
+                pos = _skip_template(text, match.end())
+                append(Token(kind, text[start:pos], start))
+                prev_kind = kind
+                break
+
+            if kind == "punct":
+                if value == "/" and (
+                    prev_kind is None
+                    or (prev_kind == "punct" and prev_text in REGEX_PRECEDERS)
+                    or (prev_kind == "ident" and prev_text in REGEX_KEYWORDS)
+                ):
+                    body = REGEX_BODY.match(text, match.end())
+                    if body:
+                        pos = body.end()
+                        append(Token("regex", text[start:pos], start))
+                        prev_kind = "regex"
+                        break
+                elif nested and value == "{":
+                    depth += 1
+                elif nested and value == "}":
+                    if depth == 0:
+                        return match.end()
+                    depth -= 1
+
+            append(Token(kind, value, start))
+            if kind != "comment":
+                prev_kind, prev_text = kind, value
+        else:
+            return len(text)
+
+def _skip_template(text: str, pos: int, tokens: Optional[List[Token]] = None) -> int:
+    """
+    End of a template literal whose opening backtick ends at pos. The tokens
+    of its `${...}` expressions go to tokens when given.
+    """
+    length = len(text)
+
+    while pos < length:
+        pos = TEMPLATE_CHUNK.match(text, pos).end()
+        if text.startswith("${", pos):
+            pos = _lex(text, pos + 2, [] if tokens is None else tokens, nested=True)
+        elif pos < length and text[pos] == "`":
+            return pos + 1
+        elif pos < length:
+            pos += 1  # Dangling backslash at end of input
+
+    return length
+
+def tokenize(text: str) -> List[Token]:
+    """Tokens of a TypeScript/TSX source (whitespace dropped, comments kept)"""
+    tokens: List[Token] = []
+    _lex(text, 0, tokens)
+    return tokens
+
+def template_tokens(template: Token) -> List[Token]:
+    """Tokens of a template literal's `${...}` expressions (offsets in the whole source)"""
+    tokens: List[Token] = []
+    _skip_template(template.text, 1, tokens)
+    return [Token(kind, text, start + template.start) for kind, text, start in tokens]
+
+# ---------------------------------------------------------------------------
+# Doc comments
+# ---------------------------------------------------------------------------
+
+def doc_tag(comment: str) -> Optional[re.Match]:
+    """
+    The @doc tag of a JSDoc block: its first @doc: target (match group 1).
+    Extraction makes one doclet of a block, for this tag, so it is also what
+    counts as already tagged; later @doc: lines in the block are ignored.
+    """
+    return DOC_TAG_PATTERN.search(comment)
+
+def iter_doc_tags(text: str) -> Iterator[Tuple[str, int]]:
+    """(@doc target, line) of every tagged JSDoc block, without tokenizing the source"""
+    if "@doc:" not in text:
+        return
+    for line, comment in iter_doc_comments(text):
+        tag = doc_tag(comment)
+        if tag:
+            yield tag.group(1), line + comment.count("\n", 0, tag.start())
+
+def _regex_at(text: str, pos: int) -> bool:
+    """Decide whether the "/" at pos opens a regex literal (vs. a division)"""
+    i = pos - 1
+    while i >= 0 and text[i] in " \t\r\n":
+        i -= 1
+    if i < 0 or text[i] in REGEX_PRECEDERS or (i > 0 and text[i - 1:i + 1] in REGEX_PRECEDERS):
+        return True
+    end = i + 1
+    while i >= 0 and (text[i].isalnum() or text[i] in "_$"):
+        i -= 1
+    return text[i + 1:end] in REGEX_KEYWORDS
+
+def _clean_comment(body: str) -> str:
+    """
+    Strip JSDoc decoration from the text between /** and */: each line is
+    trimmed and loses one leading "*". A trailing blank line left by a
+    closing "*/" on its own line is dropped.
+    """
+    lines = []
+    for line in body.split("\n"):
+        line = line.strip()
+        if line.startswith("*"):
+            line = line[1:].strip()
+        lines.append(line)
+
+    if len(lines) > 1 and not lines[-1]:
+        lines.pop()
+
+    return "\n".join(lines)
+
+def iter_doc_comments(text: str) -> Iterator[Tuple[int, str]]:
+    """
+    Single forward pass over TypeScript source yielding (start_line,
+    comment_text) for every /** ... */ block.
+
+    Tracks line comments, block comments, string literals, template
+    literals (including nested ${...} expressions) and regex literals, so
+    "/**" inside any of them is not mistaken for a doc comment. Each state
+    jumps straight to its next significant character, keeping the cost
+    linear in file size.
+    """
+    pos = 0
+    length = len(text)
+    line = 1
+    line_pos = 0
+    # Brace depth of each open ${...} expression, innermost last
+    template_stack: List[int] = []
+
+    while pos < length:
+        if template_stack and template_stack[-1] < 0:
+            # Inside a template literal's text
+            template_stack.pop()
+            match = TEMPLATE_TOKEN.search(text, pos)
+            while match and match.group() not in ("`", "${"):
+                match = TEMPLATE_TOKEN.search(text, match.end())
+            if not match:
+                return
+            pos = match.end()
+            if match.group() == "${":
+                template_stack.append(0)
+            continue
+
+        pattern = CODE_TOKEN_IN_TEMPLATE if template_stack else CODE_TOKEN
+        match = pattern.search(text, pos)
+        if not match:
+            return
+
+        token = match.group()
+        start = match.start()
+        pos = match.end()
+
+        if token == "/*":
+            end = text.find("*/", pos)
+            end = length if end < 0 else end
+            if text.startswith("*", pos) and end > pos:
+                line += text.count("\n", line_pos, start)
+                line_pos = start
+                yield line, _clean_comment(text[pos + 1:end])
+            pos = end + 2
+        elif token == "//":
+            end = text.find("\n", pos)
+            pos = length if end < 0 else end + 1
+        elif token in STRING_END:
+            pos = STRING_END[token].match(text, pos).end()
+        elif token == "`":
+            template_stack.append(-1)
+        elif token == "/":
+            if _regex_at(text, start):
+                body = REGEX_BODY.match(text, pos)
+                if body:
+                    pos = body.end()
+        elif token == "{":
+            template_stack[-1] += 1
+        elif token == "}":
+            if template_stack[-1] == 0:
+                # End of ${...}: back to the enclosing template literal
+                template_stack[-1] = -1
+            else:
+                template_stack[-1] -= 1
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+TypeScript Export Symbol Index
+
+Persistent index of the exported symbols in the TypeScript sources, shared by
+audit_taggable_items.py, generate_tagging_plan.py and apply_tags.py so none
+of them has to find declarations in source text again.
+
+For every indexed file it stores:
+- symbols: name, kind (function, const, class, interface, type, enum,
+  namespace, property), role (table, router, procedure), line, byte offset,
+  the router a procedure belongs to, and the @doc target of an attached
+  JSDoc block (has_doc)
+- tags: the @doc tag of every JSDoc block in the file (ts_lexer.doc_tag())
+- env refs: every `process.env.X` / `process.env["X"]` read and every key
+  destructured from process.env, with its line
+
+Symbols come from the tokens of the shared lexer (ts_lexer.py: comments,
+strings, template literals and regex literals are recognised so they cannot
+produce false declarations). Besides top-level exports it records the
+procedures of `export const xRouter = router({ key: someProcedure... })`
+objects.
+
+The index lives in .cache/docs-pipeline/ts-symbols.sqlite and is updated
+incrementally: files whose size and mtime are unchanged are not read, files
+whose content hash is unchanged are not re-tokenized. It is rebuilt when its
+schema version, this module or the lexer changes.
+
+Callers that only need some files' tags (or their env refs when they mention
+process) pass markers to update(): a file containing none of its markers is
+not tokenized and only its tags are stored. Such an entry is completed the
+first time a caller asks for its symbols.
+
+Usage (inspect a file): python3 scripts/ts_symbol_index.py path/to/file.ts
+"""
+
+import os
+import re
+import sys
+import bisect
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import ts_lexer
+from fingerprints import source_fingerprint
+from ts_lexer import Token, doc_tag, iter_doc_tags, template_tokens, tokenize
+
+INDEX_FILE = ".cache/docs-pipeline/ts-symbols.sqlite"
+INDEX_SCHEMA_VERSION = 3
+
+PathLike = Union[str, Path]
+
+class Symbol(NamedTuple):
+    name: str
+    kind: str
+    role: Optional[str]       # table, router, procedure or None
+    container: Optional[str]  # router export a procedure belongs to
+    exported: bool
+    line: int                 # 1-based line of the declaration's first token
+    offset: int               # byte offset of the declaration's first token
+    doc_tag: Optional[str]    # @doc target of the attached JSDoc block
+
+    @property
+    def has_doc(self) -> bool:
+        return self.doc_tag is not None
+
+# Symbols that can become audit items, by item type
+ITEM_SYMBOLS: Dict[str, Callable[[Symbol], bool]] = {
+    "trpc_procedure": lambda s: s.role == "procedure",
+    "database_table": lambda s: s.role == "table",
+    "react_component": lambda s: s.exported and s.kind in ("function", "const"),
+}
+
+# ---------------------------------------------------------------------------
+# Symbol extraction
+# ---------------------------------------------------------------------------
+
+DECLARATION_KINDS = {"function", "class", "interface", "type", "enum", "namespace", "module"}
+EXPORT_MODIFIERS = {"default", "declare", "async", "abstract"}
+
+class _Parser:
+    """Walks the significant tokens; docs maps a token's index to the JSDoc block right before it"""
+
+    def __init__(self, code: List[Token], docs: Dict[int, Token], locate: Callable[[int], Tuple[int, int]]):
+        self.code = code
+        self.docs = docs
+        self.locate = locate
+        self.symbols: List[Symbol] = []
+
+    def text(self, i: int) -> str:
+        return self.code[i].text if 0 <= i < len(self.code) else ""
+
+    def ident(self, i: int) -> Optional[str]:
+        if 0 <= i < len(self.code) and self.code[i].kind == "ident":
+            return self.code[i].text
+        return None
+
+    def add(self, i: int, name: str, kind: str, role: Optional[str] = None,
+            container: Optional[str] = None, exported: bool = True):
+        doc = self.docs.get(i)
+        line, offset = self.locate(self.code[i].start)
+        tag = doc_tag(doc.text) if doc else None
+        target = tag.group(1) if tag else None
+        self.symbols.append(Symbol(name, kind, role, container, exported, line, offset, target))
+
+    def parse(self) -> List[Symbol]:
+        # Declarations start at an `export`; tokens a declaration consumed are skipped
+        i = 0
+        for j in [j for j, token in enumerate(self.code) if token.text == "export"]:
+            if j >= i and self.code[j].kind == "ident" and self.is_statement(j):
+                i = self.parse_export(j)
+        return self.symbols
+
+    def is_statement(self, i: int) -> bool:
+        """`export` keyword rather than a member (obj.export) or key (export: ...)"""
+        if i and self.text(i - 1) in (".", "?."):
+            return False
+        return self.text(i + 1) != ":"
+
+    def parse_export(self, i: int) -> int:
+        j = i + 1
+        while self.text(j) in EXPORT_MODIFIERS:
+            j += 1
+
+        keyword = self.text(j)
+
+        if keyword == "function":
+            j += 1
+            if self.text(j) == "*":
+                j += 1
+            name = self.ident(j)
+            if name:
+                self.add(i, name, "function")
+            return j + 1
+
+        if keyword == "const" and self.text(j + 1) == "enum":
+            keyword, j = "enum", j + 1
+
+        if keyword in DECLARATION_KINDS:
+            name = self.ident(j + 1)
+            if name:
+                self.add(i, name, "namespace" if keyword == "module" else keyword)
+            return j + 2
+
+        if keyword in ("const", "let", "var"):
+            name = self.ident(j + 1)
+            if not name:
+                return j + 1
+            return self.parse_variable(i, j + 2, name, keyword)
+
+        # export { ... }, export * from, export default <expression>
+        return j
+
+    def parse_variable(self, i: int, j: int, name: str, kind: str) -> int:
+        """Exported variable; `=` right after the name decides its role"""
+        if self.text(j) != "=":
+            self.add(i, name, kind)
+            return j
+
+        value = j + 1
+        callee = self.ident(value)
+
+        if callee == "pgTable" and self.text(value + 1) == "(":
+            self.add(i, name, kind, role="table")
+        elif callee == "router" and self.text(value + 1) == "(" and self.text(value + 2) == "{":
+            self.add(i, name, kind, role="router")
+            return self.parse_router(value + 2, name)
+        elif callee and self.text(value + 1) == "." and self.text(value + 2) in ("query", "mutation"):
+            self.add(i, name, kind, role="procedure")
+        else:
+            self.add(i, name, kind)
+
+        return value
+
+    def parse_router(self, start: int, router_name: str) -> int:
+        """Record `key: xProcedure...` properties of the router({ ... }) object at start"""
+        depth = 0
+        i = start
+
+        while i < len(self.code):
+            value = self.text(i)
+
+            if value in ("(", "{", "["):
+                depth += 1
+            elif value in (")", "}", "]"):
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            elif (
+                depth == 1
+                and value != ":"
+                and self.text(i - 1) in ("{", ",")
+                and self.text(i + 1) == ":"
+                and self.code[i].kind in ("ident", "string")
+                and self.is_procedure(i + 2)
+            ):
+                key = value if self.code[i].kind == "ident" else value[1:-1]
+                self.add(i, key, "property", role="procedure", container=router_name, exported=False)
+
+            i += 1
+
+        return i
+
+    def is_procedure(self, i: int) -> bool:
+        """Value starting at i is a procedure builder (publicProcedure..., t.procedure...)"""
+        name = self.ident(i)
+        if not name:
+            return False
+        return name.endswith("Procedure") or (self.text(i + 1) == "." and self.text(i + 2) == "procedure")
+
+def _locator(text: str, line_starts: List[int]) -> Callable[[int], Tuple[int, int]]:
+    """Map increasing character offsets to (line, byte offset)"""
+    state = [0, 0]  # last character offset, its byte offset
+
+    def locate(pos: int) -> Tuple[int, int]:
+        if pos < state[0]:
+            state[0], state[1] = 0, 0
+        state[1] += len(text[state[0]:pos].encode('utf-8'))
+        state[0] = pos
+        return bisect.bisect_right(line_starts, pos), state[1]
+
+    return locate
+
+def _destructured_keys(tokens: List[Token], close: int) -> List[Token]:
+    """Key tokens of the object pattern ending with the "}" at close ({ A, B: b, C = 1, ...rest })"""
+    depth = 0
+    for start in range(close, -1, -1):
+        depth += {"}": 1, "{": -1}.get(tokens[start].text, 0)
+        if depth == 0:
+            break
+    else:
+        return []
+
+    keys = []
+    depth = 0
+    for k in range(start + 1, close):
+        text = tokens[k].text
+        if text in ("{", "[", "("):
+            depth += 1
+        elif text in ("}", "]", ")"):
+            depth -= 1
+        elif depth == 0 and tokens[k - 1].text in ("{", ",") and tokens[k].kind in ("ident", "string"):
+            keys.append(tokens[k])
+    return keys
+
+def _env_refs(tokens: List[Token], line_starts: List[int], refs: List[Tuple[str, int]]):
+    """
+    Add (name, line) of every process.env.NAME / process.env["NAME"] read and
+    every key destructured from process.env ({ NAME } = process.env),
+    templates included
+    """
+    for i, token in enumerate(tokens):
+        if token.kind == "template":
+            if "process" in token.text:
+                _env_refs(template_tokens(token), line_starts, refs)
+            continue
+        if token.text != "process" or token.kind != "ident" or i + 2 >= len(tokens):
+            continue
+        if tokens[i + 1].text not in (".", "?.") or tokens[i + 2].text != "env":
+            continue
+
+        if i >= 2 and tokens[i - 2].text == "}" and tokens[i - 1].text == "=":
+            # Each destructured key is a read, on its own line
+            for key in _destructured_keys(tokens, i - 2):
+                name = key.text[1:-1] if key.kind == "string" else key.text
+                refs.append((name, bisect.bisect_right(line_starts, key.start)))
+            continue
+        if i + 4 >= len(tokens):
+            continue
+
+        access, key = tokens[i + 3], tokens[i + 4]
+        if access.text in (".", "?.") and key.kind == "ident":
+            name = key.text
+        elif access.text == "[" and key.kind == "string" and i + 5 < len(tokens) and tokens[i + 5].text == "]":
+            name = key.text[1:-1]
+        else:
+            continue
+
+        refs.append((name, bisect.bisect_right(line_starts, token.start)))
+
+def scan_source(text: str) -> Tuple[List[Symbol], List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """Symbols, (@doc target, line) JSDoc block tags and (env var, line) reads of one source text"""
+    line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+    tokens = tokenize(text)
+    code = [token for token in tokens if token.kind != "comment"]
+    docs: Dict[int, Token] = {}
+    tags: List[Tuple[str, int]] = []
+
+    comments = [k for k, token in enumerate(tokens) if token.kind == "comment"]
+    for n, k in enumerate(comments):
+        token = tokens[k]
+        if token.text.startswith("/**"):
+            # Attached to the next code token, the (k - n)th; the last block wins
+            docs[k - n] = token
+            tag = doc_tag(token.text)
+            if tag:
+                tags.append((tag.group(1), bisect.bisect_right(line_starts, token.start + tag.start())))
+
+    env_refs: List[Tuple[str, int]] = []
+    if "process" in text:
+        _env_refs(code, line_starts, env_refs)
+
+    return _Parser(code, docs, _locator(text, line_starts)).parse(), tags, env_refs
+
+# ---------------------------------------------------------------------------
+# SQLite index
+# ---------------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    tokenized INTEGER NOT NULL  -- 0: only tags stored (no marker found)
+);
+CREATE TABLE symbols (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    role TEXT,
+    container TEXT,
+    exported INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    doc_tag TEXT,
+    PRIMARY KEY (path, seq)
+);
+CREATE INDEX symbols_by_name ON symbols (path, name);
+CREATE TABLE tags (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    PRIMARY KEY (path, seq)
+);
+CREATE TABLE env_refs (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    PRIMARY KEY (path, seq)
+);
+"""
+
+SYMBOL_COLUMNS = "name, kind, role, container, exported, line, offset, doc_tag"
+
+def tokenizer_fingerprint() -> str:
+    """Fingerprint of the index: this module and the lexer (see fingerprints.py)"""
+    return source_fingerprint(__file__, ts_lexer.__file__)
+
+def _read_bytes(file_path: PathLike) -> bytes:
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+def _index_file(
+    file_path: PathLike, cached: Optional[Dict], read: Callable[[PathLike], bytes],
+    markers: Optional[Iterable[bytes]] = None,
+) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+    """
+    Stat, hash and (if needed) tokenize one file. Returns (status, entry,
+    error) where status is "unchanged", "cached", "parsed", "skipped" or
+    "error". Entries for "unchanged" files are None (symbols stay in the
+    database).
+
+    With markers, a file containing none of them is "skipped": only its tags
+    are read. An entry stored that way is only reused for callers passing
+    markers.
+    """
+    try:
+        if cached and not cached["tokenized"] and markers is None:
+            cached = None
+
+        stat = os.stat(file_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return "unchanged", None, None
+
+        data = read(file_path)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }
+        if cached and cached["sha256"] == entry["sha256"]:
+            entry["tokenized"] = cached["tokenized"]
+            return "cached", entry, None
+
+        text = data.decode('utf-8')
+        if markers is not None and not any(marker in data for marker in markers):
+            entry["tokenized"] = False
+            entry["symbols"], entry["env_refs"] = [], []
+            entry["tags"] = list(iter_doc_tags(text))
+            return "skipped", entry, None
+
+        entry["tokenized"] = True
+        entry["symbols"], entry["tags"], entry["env_refs"] = scan_source(text)
+        return "parsed", entry, None
+    except Exception as e:
+        return "error", None, e
+
+class IndexedFile(NamedTuple):
+    symbols: List[Symbol]
+    tags: List[Tuple[str, int]]
+    env_refs: List[Tuple[str, int]]
+
+class SymbolIndex:
+    """Persistent per-file symbol index (one SQLite connection, main thread only)"""
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.fingerprint = tokenizer_fingerprint()
+        self.conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        try:
+            conn = sqlite3.connect(self.path)
+            if self._is_current(conn):
+                conn.execute("PRAGMA foreign_keys = ON")
+                return conn
+            conn.close()
+        except sqlite3.DatabaseError as e:
+            print(f"⚠️  Rebuilding unreadable symbol index {self.path}: {e}")
+
+        # Out of date or corrupt: start over
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('tokenizer', ?)", (self.fingerprint,))
+        return conn
+
+    def _is_current(self, conn: sqlite3.Connection) -> bool:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+            return False
+        row = conn.execute("SELECT value FROM meta WHERE key = 'tokenizer'").fetchone()
+        return row is not None and row[0] == self.fingerprint
+
+    def close(self):
+        self.conn.close()
+
+    def clear(self):
+        """Forget every indexed file"""
+        with self.conn:
+            self.conn.execute("DELETE FROM files")
+
+    def _cached(self, path: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sha256, tokenized FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        size, mtime_ns, sha256, tokenized = row
+        return {"size": size, "mtime_ns": mtime_ns, "sha256": sha256, "tokenized": bool(tokenized)}
+
+    def _store(self, path: str, status: str, entry: Dict):
+        self.conn.execute(
+            "INSERT INTO files (path, size, mtime_ns, sha256, tokenized) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET "
+            "size = excluded.size, mtime_ns = excluded.mtime_ns, sha256 = excluded.sha256, "
+            "tokenized = excluded.tokenized",
+            (path, entry["size"], entry["mtime_ns"], entry["sha256"], int(entry["tokenized"]))
+        )
+        if status not in ("parsed", "skipped"):
+            return
+
+        self.conn.execute("DELETE FROM symbols WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM tags WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM env_refs WHERE path = ?", (path,))
+        self.conn.executemany(
+            f"INSERT INTO symbols (path, seq, {SYMBOL_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(path, seq, *symbol) for seq, symbol in enumerate(entry["symbols"])]
+        )
+        self.conn.executemany(
+            "INSERT INTO tags (path, seq, tag, line) VALUES (?, ?, ?, ?)",
+            [(path, seq, tag, line) for seq, (tag, line) in enumerate(entry["tags"])]
+        )
+        self.conn.executemany(
+            "INSERT INTO env_refs (path, seq, name, line) VALUES (?, ?, ?, ?)",
+            [(path, seq, name, line) for seq, (name, line) in enumerate(entry["env_refs"])]
+        )
+
+    def _load(self, path: str) -> IndexedFile:
+        symbols = [
+            Symbol(name, kind, role, container, bool(exported), line, offset, doc_tag)
+            for name, kind, role, container, exported, line, offset, doc_tag in self.conn.execute(
+                f"SELECT {SYMBOL_COLUMNS} FROM symbols WHERE path = ? ORDER BY seq", (path,)
+            )
+        ]
+        tags = list(self.conn.execute(
+            "SELECT tag, line FROM tags WHERE path = ? ORDER BY seq", (path,)
+        ))
+        env_refs = list(self.conn.execute(
+            "SELECT name, line FROM env_refs WHERE path = ? ORDER BY seq", (path,)
+        ))
+        return IndexedFile(symbols, tags, env_refs)
+
+    def update(
+        self,
+        paths: Iterable[PathLike],
+        read: Callable[[PathLike], bytes] = _read_bytes,
+        map_fn: Callable = map,
+        markers: Optional[Dict[PathLike, Iterable[bytes]]] = None,
+    ) -> Iterator[Tuple[PathLike, str, Optional[IndexedFile], Optional[Exception]]]:
+        """
+        Bring the given files up to date and yield (path, status, indexed
+        file, error) in input order. Reading and tokenizing go through map_fn
+        (e.g. a thread pool's map); database access stays on this thread and
+        is committed once every file has been yielded.
+
+        markers maps paths to the byte strings that make them worth
+        tokenizing (no entry: always tokenize; empty: tags only). A skipped
+        file yields its tags with no symbols or env refs.
+        """
+        paths = list(paths)
+        markers = markers or {}
+        cached = {str(path): self._cached(str(path)) for path in paths}
+        results = map_fn(
+            lambda path: _index_file(path, cached[str(path)], read, markers.get(path)), paths
+        )
+
+        with self.conn:
+            for path, (status, entry, error) in zip(paths, results):
+                if status == "error":
+                    yield path, status, None, error
+                    continue
+
+                if status != "unchanged":
+                    self._store(str(path), status, entry)
+
+                if status in ("parsed", "skipped"):
+                    indexed = IndexedFile(entry["symbols"], entry["tags"], entry["env_refs"])
+                else:
+                    indexed = self._load(str(path))
+
+                yield path, status, indexed, None
+
+    def prune(self, keep: Iterable[PathLike]) -> int:
+        """Drop every file not in `keep`; returns how many were dropped"""
+        keep = {str(path) for path in keep}
+        stale = [(path,) for (path,) in self.conn.execute("SELECT path FROM files") if path not in keep]
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", stale)
+        return len(stale)
+
+    def file(self, file_path: PathLike) -> IndexedFile:
+        """Symbols and tags of one file, refreshed first if it changed"""
+        # Consume the whole generator so the update is committed
+        [(_, _, indexed, error)] = list(self.update([file_path]))
+        if error:
+            raise error
+        return indexed
+
+    def find(self, file_path: PathLike, name: str,
+             where: Optional[Callable[[Symbol], bool]] = None) -> Optional[Symbol]:
+        """First symbol called `name` in a file (optionally also matching `where`)"""
+        for symbol in self.file(file_path).symbols:
+            if symbol.name == name and (where is None or where(symbol)):
+                return symbol
+        return None
+
+def main(argv: Optional[List[str]] = None):
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("Usage: python3 scripts/ts_symbol_index.py FILE [FILE ...]")
+        return 1
+
+    index = SymbolIndex()
+    try:
+        for path, status, indexed, error in index.update(paths):
+            print(f"📄 {path} ({status})")
+            if error:
+                print(f"   ⚠️  {error}")
+                continue
+            for symbol in indexed.symbols:
+                role = f" [{symbol.role}]" if symbol.role else ""
+                container = f" in {symbol.container}" if symbol.container else ""
+                doc = f" @doc:{symbol.doc_tag}" if symbol.has_doc else ""
+                print(f"   {symbol.line:>5}  {symbol.kind} {symbol.name}{role}{container}{doc}")
+            for name, line in indexed.env_refs:
+                print(f"   {line:>5}  env {name}")
+    finally:
+        index.close()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())